@@ -0,0 +1,164 @@
+import math
+import os
+import threading
+import time
+
+
+class AdmissionController:
+    """
+    Adaptive concurrency limit for ``/api/recognize``.
+
+    Each admitted request holds a slot until it finishes.  The limit follows
+    AIMD on observed latency: when a request finishes over *target_ms* the
+    limit shrinks by *backoff* (at most once per target interval, so a burst
+    of slow completions counts once), and when the limit was saturated and
+    the request finished in time it grows by ``1 / limit``.
+
+    Requests over the limit are shed without queueing:
+
+    * ``"degraded"`` — up to *degrade_slots* extra requests are admitted for a
+      cheaper answer (the camera's last result, or detection without
+      recognition);
+    * ``"reject"`` — beyond that the request is turned away with a retry hint.
+    """
+
+    MAX_REMEMBERED = 256
+
+    def __init__(
+        self,
+        target_ms: float = 300.0,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        initial_limit: int = 4,
+        degrade_slots: int = 4,
+        reuse_max_age: float = 1.0,
+        backoff: float = 0.9,
+        enabled: bool = True,
+    ):
+        self.target = target_ms / 1000
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.degrade_slots = degrade_slots
+        self.reuse_max_age = reuse_max_age
+        self.backoff = backoff
+        self.enabled = enabled
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.admitted = 0
+        self.reused = 0
+        self.detection_only = 0
+        self.rejected = 0
+        self._stage_ms: dict[str, float] = {}
+        self._last_results: dict[str, tuple[float, list]] = {}
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Settings from the ``ADMISSION_*`` environment variables."""
+        return cls(
+            target_ms=float(os.getenv("ADMISSION_TARGET_MS", "300")),
+            min_limit=int(os.getenv("ADMISSION_MIN_LIMIT", "1")),
+            max_limit=int(os.getenv("ADMISSION_MAX_LIMIT", "16")),
+            initial_limit=int(os.getenv("ADMISSION_INITIAL_LIMIT", "4")),
+            degrade_slots=int(os.getenv("ADMISSION_DEGRADE_SLOTS", "4")),
+            reuse_max_age=float(os.getenv("ADMISSION_REUSE_S", "1.0")),
+            enabled=os.getenv("ADMISSION_CONTROL", "true").lower() == "true",
+        )
+
+    # ── Admission ────────────────────────────────────────────────
+
+    def admit(self) -> str:
+        """
+        Returns ``"full"``, ``"degraded"`` or ``"reject"``.  The first two
+        take a slot that must be given back with ``release()``.
+        """
+        with self._lock:
+            limit = int(self.limit)
+            if not self.enabled or self.in_flight < limit:
+                decision = "full"
+                self.admitted += 1
+            elif self.in_flight < limit + self.degrade_slots:
+                decision = "degraded"
+            else:
+                return "reject"
+            self.in_flight += 1
+            return decision
+
+    def release(self, elapsed: float, full: bool = True):
+        """
+        Frees a slot.  Only full requests (*full*) adjust the limit, since
+        degraded ones skip the stages whose latency it tracks.
+        """
+        with self._lock:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            if not full:
+                return
+            now = time.monotonic()
+            if elapsed > self.target:
+                if now - self._last_decrease >= self.target:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def observe(self, timings: dict[str, float], alpha: float = 0.2):
+        """Folds per-stage durations (seconds) into moving averages (ms)."""
+        with self._lock:
+            for stage, seconds in timings.items():
+                ms = seconds * 1000
+                prev = self._stage_ms.get(stage)
+                self._stage_ms[stage] = ms if prev is None else prev + alpha * (ms - prev)
+
+    def retry_after(self) -> float:
+        """Seconds until a slot is likely to free up, from the average latency."""
+        total_ms = self._stage_ms.get("total", self.target * 1000)
+        backlog = max(1.0, (self.in_flight + 1) / max(self.limit, 1.0))
+        return round(total_ms / 1000 * backlog, 3)
+
+    # ── Last results ─────────────────────────────────────────────
+
+    def remember(self, camera: str, faces: list):
+        now = time.monotonic()
+        self._last_results[camera] = (now, faces)
+        if len(self._last_results) > self.MAX_REMEMBERED:
+            # Per-tab ids come and go; forget results too old to be reused
+            self._last_results = {
+                key: entry for key, entry in self._last_results.items()
+                if now - entry[0] <= self.reuse_max_age
+            }
+
+    def recent(self, camera: str) -> list | None:
+        """The last full result for *camera* if it is at most *reuse_max_age* old."""
+        entry = self._last_results.get(camera)
+        if entry is None or time.monotonic() - entry[0] > self.reuse_max_age:
+            return None
+        return entry[1]
+
+    def count(self, outcome: str):
+        """Counts a shed request: ``"reused"``, ``"detection_only"`` or ``"rejected"``."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            shed = self.reused + self.detection_only + self.rejected
+            total = self.admitted + shed
+            return {
+                "enabled": self.enabled,
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "target_ms": round(self.target * 1000, 1),
+                "admitted": self.admitted,
+                "reused": self.reused,
+                "detection_only": self.detection_only,
+                "rejected": self.rejected,
+                "shed_ratio": round(shed / total, 3) if total else 0.0,
+                "stage_ms": {k: round(v, 1) for k, v in self._stage_ms.items()},
+            }
+
+
+def retry_after_header(seconds: float) -> str:
+    """``Retry-After`` only takes whole seconds."""
+    return str(max(1, math.ceil(seconds)))
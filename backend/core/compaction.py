@@ -0,0 +1,161 @@
+"""
+Gallery compaction helpers: near-duplicate pruning and per-identity
+prototypes over the cached embeddings of a ``FaceRecognizer``.
+
+All functions work on cosine geometry, i.e. on L2-normalised embeddings.
+"""
+import numpy as np
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalises each row of *matrix* (or a single 1-D vector)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / (norms + 1e-10)
+
+
+def dedupe(embeddings: np.ndarray, threshold: float = 0.95) -> list[int]:
+    """
+    Greedy near-duplicate removal.  Returns the indices to keep: a row is
+    dropped when its cosine similarity to an already kept row is at least
+    *threshold*.
+    """
+    unit = normalize(embeddings)
+    kept: list[int] = []
+    for i in range(len(unit)):
+        if kept and float(np.max(unit[kept] @ unit[i])) >= threshold:
+            continue
+        kept.append(i)
+    return kept
+
+
+def prototypes(embeddings: np.ndarray, k: int = 3, iterations: int = 10) -> np.ndarray:
+    """
+    Up to *k* representative unit vectors for one identity (spherical k-means
+    with farthest-point initialisation, so the result is deterministic).
+    """
+    unit = normalize(embeddings)
+    k = min(k, len(unit))
+    if k <= 1:
+        return normalize(unit.mean(axis=0, keepdims=True))
+
+    centers = [unit[0]]
+    for _ in range(1, k):
+        sims = np.max(unit @ np.stack(centers).T, axis=1)
+        centers.append(unit[int(np.argmin(sims))])
+    centers = np.stack(centers)
+
+    for _ in range(iterations):
+        labels = np.argmax(unit @ centers.T, axis=1)
+        updated = np.stack([
+            unit[labels == c].mean(axis=0) if np.any(labels == c) else centers[c]
+            for c in range(k)
+        ])
+        updated = normalize(updated)
+        if np.allclose(updated, centers):
+            break
+        centers = updated
+    return centers
+
+
+def build_prototypes(entries: list[dict], k: int = 3) -> tuple[list[str], np.ndarray]:
+    """Returns ``(names, unit_matrix)`` with up to *k* prototype rows per identity."""
+    by_name: dict[str, list[np.ndarray]] = {}
+    for entry in entries:
+        by_name.setdefault(entry["name"], []).append(entry["embedding"])
+
+    names: list[str] = []
+    rows: list[np.ndarray] = []
+    for name, embs in by_name.items():
+        protos = prototypes(np.stack(embs), k)
+        names.extend([name] * len(protos))
+        rows.append(protos)
+    if not rows:
+        return [], np.empty((0, 0), dtype=np.float32)
+    return names, np.concatenate(rows).astype(np.float32)
+
+
+def plan(entries: list[dict], threshold: float = 0.95) -> tuple[list[dict], list[dict]]:
+    """Splits *entries* into ``(kept, dropped)`` near-duplicates, per identity."""
+    by_name: dict[str, list[dict]] = {}
+    for entry in entries:
+        by_name.setdefault(entry["name"], []).append(entry)
+
+    kept: list[dict] = []
+    dropped: list[dict] = []
+    for group in by_name.values():
+        keep = set(dedupe(np.stack([e["embedding"] for e in group]), threshold))
+        for i, entry in enumerate(group):
+            (kept if i in keep else dropped).append(entry)
+    return kept, dropped
+
+
+def match_rate(
+    queries: list[dict],
+    names: list[str],
+    matrix: np.ndarray,
+    threshold: float,
+    paths: list[str] | None = None,
+    batch: int = 1024,
+) -> float:
+    """
+    Fraction of *queries* whose best match in the gallery (``names`` /
+    unit ``matrix``) is their own identity within *threshold* cosine
+    distance.  When *paths* is given, a query never matches the gallery row
+    built from its own image (leave-one-out).
+    """
+    if not queries or not len(matrix):
+        return 0.0
+    name_arr = np.array(names)
+    path_arr = np.array(paths) if paths is not None else None
+    hits = 0
+    for start in range(0, len(queries), batch):
+        chunk = queries[start : start + batch]
+        q = normalize(np.stack([e["embedding"] for e in chunk]))
+        dist = 1.0 - q @ matrix.T
+        if path_arr is not None:
+            own = path_arr[None, :] == np.array([e["path"] for e in chunk])[:, None]
+            dist[own] = np.inf
+        best = np.argmin(dist, axis=1)
+        best_dist = dist[np.arange(len(chunk)), best]
+        for entry, idx, d in zip(chunk, best, best_dist):
+            hits += int(name_arr[idx] == entry["name"] and d <= threshold)
+    return hits / len(queries)
+
+
+def prototype_match_rate(
+    queries: list[dict],
+    gallery: list[dict],
+    k: int,
+    threshold: float,
+) -> float:
+    """
+    ``match_rate`` against per-identity prototypes built from *gallery*,
+    leave-one-out: when a query is itself a gallery entry, its identity's
+    prototypes are rebuilt without it, so no query is matched against a
+    centre it helped to form.
+    """
+    if not queries or not gallery:
+        return 0.0
+    by_name: dict[str, list[dict]] = {}
+    for entry in gallery:
+        by_name.setdefault(entry["name"], []).append(entry)
+    protos = {name: prototypes(np.stack([e["embedding"] for e in group]), k)
+              for name, group in by_name.items()}
+
+    hits = 0
+    for query in queries:
+        q = normalize(query["embedding"])
+        own = by_name.get(query["name"], [])
+        if any(e["path"] == query["path"] for e in own):
+            rest = [e["embedding"] for e in own if e["path"] != query["path"]]
+            own_protos = prototypes(np.stack(rest), k) if rest else None
+        else:
+            own_protos = protos.get(query["name"])
+
+        best_own = float(np.min(1.0 - own_protos @ q)) if own_protos is not None else np.inf
+        best_other = min(
+            (float(np.min(1.0 - p @ q)) for name, p in protos.items() if name != query["name"]),
+            default=np.inf,
+        )
+        hits += int(best_own <= threshold and best_own <= best_other)
+    return hits / len(queries)
@@ -1,5 +1,6 @@
-import tensorflow as tf
-from mtcnn import MTCNN
+import threading
+
+import numpy as np
 
 
 def _configure_gpu() -> str:
@@ -11,6 +12,8 @@ def _configure_gpu() -> str:
     Without it TF allocates the entire GPU VRAM upfront, which causes
     OOM errors on shared or low-VRAM cards.
     """
+    import tensorflow as tf
+
     gpus = tf.config.list_physical_devices("GPU")
     if gpus:
         try:
@@ -32,18 +35,32 @@ class FaceDetector:
     TF runtime is configured correctly. The `_configure_gpu()` call in
     `_get_detector()` ensures memory growth is set before the first
     TF operation.
+
+    TensorFlow and MTCNN are imported on first use so that importing this
+    module (and the FastAPI app) stays cheap; call `warmup()` from a
+    background thread to pay that cost before the first frame arrives.
     """
 
     def __init__(self):
         self._detector = None
         self._device_info: str | None = None
+        self._init_lock = threading.Lock()
 
-    def _get_detector(self) -> MTCNN:
+    @property
+    def is_loaded(self) -> bool:
+        return self._detector is not None
+
+    def _get_detector(self):
         if self._detector is None:
-            self._device_info = _configure_gpu()
-            print(f"[FaceDetector] Initializing MTCNN on {self._device_info}")
-            self._detector = MTCNN()
-            print("[FaceDetector] MTCNN ready.")
+            # Several worker threads may hit the first frame at once; build MTCNN only once
+            with self._init_lock:
+                if self._detector is None:
+                    from mtcnn import MTCNN
+
+                    self._device_info = _configure_gpu()
+                    print(f"[FaceDetector] Initializing MTCNN on {self._device_info}")
+                    self._detector = MTCNN()
+                    print("[FaceDetector] MTCNN ready.")
         return self._detector
 
     def detect_faces(self, frame):
@@ -57,3 +74,8 @@ class FaceDetector:
         except Exception as e:
             print(f"[FaceDetector] Error during detection: {e}")
             return []
+
+    def warmup(self):
+        """Builds MTCNN and runs one dummy detection so TF graphs are traced."""
+        detector = self._get_detector()
+        detector.detect_faces(np.zeros((160, 160, 3), dtype=np.uint8))
@@ -0,0 +1,202 @@
+import os
+import queue
+import shutil
+import tarfile
+import threading
+import uuid
+import zipfile
+from collections import OrderedDict
+from datetime import datetime
+
+from .recognizer import FaceRecognizer
+
+
+class BulkEnrollment:
+    """
+    Background bulk enrollment from a zip/tar archive of ``identity/image``
+    entries.
+
+    Jobs run one at a time on a single daemon runner thread, so concurrent
+    uploads queue up instead of multiplying embedding threads that compete
+    with ``/api/recognize``.  Members are copied one at a time from the
+    archive into ``db_path/<identity>/`` (never loading the whole archive in
+    memory), then the new images are embedded in parallel batches with
+    ``FaceRecognizer.add_images`` so recognition keeps serving from the
+    existing cache while the gallery grows.  The file cache is written once,
+    when the job ends.
+    """
+
+    BATCH_SIZE = 64
+    MAX_ERRORS = 1000
+
+    def __init__(self, max_workers: int = 4, keep_jobs: int = 50):
+        self.max_workers = max_workers
+        self.keep_jobs = keep_jobs
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        threading.Thread(target=self._runner, daemon=True).start()
+
+    # ── Public API ───────────────────────────────────────────────
+
+    def submit(self, archive_path: str, recognizer: FaceRecognizer) -> dict:
+        """Starts a job for *archive_path* (deleted when the job ends)."""
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "status": "queued",
+            "db_path": recognizer.db_path,
+            "created_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "files_total": 0,
+            "extracted": 0,
+            "embedded": 0,
+            "failed": 0,
+            "identities": 0,
+            "errors": [],
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+            while len(self._jobs) > self.keep_jobs:
+                self._jobs.popitem(last=False)
+
+        self._queue.put((job, archive_path, recognizer))
+        return self.get(job["id"])
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job, errors=list(job["errors"])) if job else None
+
+    def jobs(self) -> list[dict]:
+        with self._lock:
+            return [
+                {k: v for k, v in job.items() if k != "errors"}
+                for job in reversed(self._jobs.values())
+            ]
+
+    # ── Job execution ────────────────────────────────────────────
+
+    def _runner(self):
+        while True:
+            self._run(*self._queue.get())
+
+    def _run(self, job: dict, archive_path: str, recognizer: FaceRecognizer):
+        embedded = False
+        try:
+            job["status"] = "extracting"
+            members = self._extract(job, archive_path, recognizer.db_path)
+            paths = list(members)
+
+            job["status"] = "embedding"
+            for i in range(0, len(paths), self.BATCH_SIZE):
+                embedded = True
+                recognizer.add_images(
+                    paths[i : i + self.BATCH_SIZE],
+                    max_workers=self.max_workers,
+                    on_progress=lambda path, error: self._on_embedded(job, members[path], error),
+                    save=False,
+                )
+            job["status"] = "done"
+        except Exception as e:
+            job["status"] = "error"
+            self._error(job, None, str(e))
+            print(f"[enrollment] Job {job['id']} failed: {e}")
+        finally:
+            if embedded:
+                recognizer.save_cache()
+            job["finished_at"] = datetime.utcnow().isoformat()
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+
+        print(f"[enrollment] Job {job['id']} {job['status']}: {job['embedded']} embedded, "
+              f"{job['failed']} failed, {job['identities']} identities")
+
+    def _extract(self, job: dict, archive_path: str, db_path: str) -> dict[str, str]:
+        """
+        Copies the archive's images into *db_path*.  Returns ``{dest: member}``
+        so later errors are reported by archive entry name, never by server path.
+        """
+        members: dict[str, str] = {}
+        identities: set[str] = set()
+
+        for name, open_member in self._members(archive_path):
+            job["files_total"] += 1
+            parts = [p for p in name.replace("\\", "/").split("/") if p]
+            if len(parts) < 2:
+                self._error(job, name, "Expected 'identity/image' layout")
+                continue
+            identity, filename = parts[-2], parts[-1]
+            if identity.startswith(".") or ".." in parts:
+                self._error(job, name, "Invalid identity folder name")
+                continue
+            if not FaceRecognizer._is_image(filename):
+                self._error(job, name, "Not an image file")
+                continue
+
+            person_dir = os.path.join(db_path, identity)
+            os.makedirs(person_dir, exist_ok=True)
+            dest = None
+            try:
+                dest, out = self._create(person_dir, filename, job["id"])
+                with out, open_member() as src:
+                    shutil.copyfileobj(src, out, 1024 * 1024)
+            except Exception as e:
+                if dest is not None and os.path.exists(dest):
+                    os.remove(dest)
+                self._error(job, name, f"Extraction failed: {e}")
+                continue
+
+            members[dest] = name
+            identities.add(identity)
+            job["extracted"] += 1
+            job["identities"] = len(identities)
+
+        return members
+
+    @staticmethod
+    def _create(person_dir: str, filename: str, job_id: str):
+        """
+        Opens a new file for *filename* in *person_dir* without overwriting
+        anything: existing names get a ``bulk_<job>_[<n>_]`` prefix.  Returns
+        ``(path, file)``.
+        """
+        dest = os.path.join(person_dir, filename)
+        n = 0
+        while True:
+            try:
+                return dest, open(dest, "xb")
+            except FileExistsError:
+                n += 1
+                prefix = f"bulk_{job_id}_" if n == 1 else f"bulk_{job_id}_{n}_"
+                dest = os.path.join(person_dir, prefix + filename)
+
+    @staticmethod
+    def _members(archive_path: str):
+        """Yields ``(name, opener)`` for each regular file in a zip or tar archive."""
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir():
+                        yield info.filename, lambda info=info: zf.open(info)
+        elif tarfile.is_tarfile(archive_path):
+            # Sequential stream mode: members are read once, in order
+            with tarfile.open(archive_path, "r|*") as tf:
+                for member in tf:
+                    if member.isfile():
+                        yield member.name, lambda member=member: tf.extractfile(member)
+        else:
+            raise ValueError("Unsupported archive format (expected zip or tar)")
+
+    def _on_embedded(self, job: dict, member: str, error: str | None):
+        with self._lock:
+            if error is None:
+                job["embedded"] += 1
+        if error is not None:
+            self._error(job, member, error)
+
+    def _error(self, job: dict, file: str | None, error: str):
+        with self._lock:
+            if file is not None:
+                job["failed"] += 1
+            if len(job["errors"]) < self.MAX_ERRORS:
+                job["errors"].append({"file": file, "error": error})
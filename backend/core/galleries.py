@@ -0,0 +1,172 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .recognizer import FaceRecognizer
+
+
+class GalleryManager:
+    """
+    Keeps several face galleries resident in memory, one ``FaceRecognizer``
+    per ``db_path``, so switching back to a recently used gallery does not
+    reload or re-embed anything.
+
+    Galleries are kept in LRU order.  When the embeddings held by all resident
+    galleries exceed *memory_budget_mb*, the least recently used ones are
+    dropped.  The active gallery and the most recently used one are never
+    evicted.
+
+    Galleries requested per frame (``/api/recognize?gallery=``) must be
+    resident already or live under *root*; cold ones are loaded in the
+    background with ``load_in_background`` so no request thread pays for a
+    full embedding build.
+    """
+
+    def __init__(
+        self,
+        model_name="VGG-Face",
+        memory_budget_mb: float = 512.0,
+        match_mode="all",
+        prototypes=3,
+        recognizer_cls=FaceRecognizer,
+        root: str | None = None,
+    ):
+        self.model_name = model_name
+        self.root = os.path.realpath(root) if root else None
+        self.recognizer_cls = recognizer_cls
+        self.match_mode = match_mode
+        self.prototypes = prototypes
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.active_path: str | None = None
+        self._galleries: OrderedDict[str, FaceRecognizer] = OrderedDict()
+        self._loading: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(db_path: str) -> str:
+        return os.path.normpath(os.path.abspath(db_path))
+
+    # ── Public API ───────────────────────────────────────────────
+
+    def get(self, db_path: str, preload: bool = True) -> FaceRecognizer:
+        """
+        Returns the recognizer for *db_path*, loading its gallery if it is not
+        resident.  Loading happens outside the lock so hits on other galleries
+        are never blocked by a slow (re)build.
+        """
+        key = self._key(db_path)
+        with self._lock:
+            recognizer = self._galleries.get(key)
+            if recognizer is not None:
+                self._galleries.move_to_end(key)
+                return recognizer
+
+        recognizer = self.recognizer_cls(
+            db_path=db_path,
+            model_name=self.model_name,
+            preload=preload,
+            match_mode=self.match_mode,
+            prototypes=self.prototypes,
+        )
+
+        with self._lock:
+            existing = self._galleries.get(key)
+            if existing is not None:
+                # Loaded concurrently by another request; keep the first one
+                self._galleries.move_to_end(key)
+                return existing
+            self._galleries[key] = recognizer
+            self._evict()
+        return recognizer
+
+    def activate(self, db_path: str, preload: bool = True) -> FaceRecognizer:
+        """Like ``get()``, and marks *db_path* as the gallery that is never evicted."""
+        recognizer = self.get(db_path, preload=preload)
+        self.active_path = self._key(db_path)
+        return recognizer
+
+    def get_resident(self, db_path: str) -> FaceRecognizer | None:
+        """Like ``get()``, but never loads: ``None`` if *db_path* is not resident."""
+        key = self._key(db_path)
+        with self._lock:
+            recognizer = self._galleries.get(key)
+            if recognizer is not None:
+                self._galleries.move_to_end(key)
+            return recognizer
+
+    def is_resident(self, db_path: str) -> bool:
+        return self._key(db_path) in self._galleries
+
+    def is_allowed(self, db_path: str) -> bool:
+        """Resident galleries, and folders under *root*, may be requested per frame."""
+        key = self._key(db_path)
+        if key in self._galleries:
+            return True
+        if self.root is None:
+            return False
+        real = os.path.realpath(key)
+        return real != self.root and os.path.commonpath([real, self.root]) == self.root
+
+    def load_in_background(self, db_path: str) -> bool:
+        """
+        Returns ``True`` if *db_path* is resident.  Otherwise starts loading it
+        on a background thread (once, however often it is asked) and returns
+        ``False``.
+        """
+        key = self._key(db_path)
+        with self._lock:
+            if key in self._galleries:
+                return True
+            if key in self._loading:
+                return False
+            self._loading.add(key)
+
+        def _load():
+            try:
+                self.get(db_path)
+            except Exception as e:
+                print(f"[galleries] Failed to load {key}: {e}")
+            finally:
+                with self._lock:
+                    self._loading.discard(key)
+
+        threading.Thread(target=_load, daemon=True).start()
+        return False
+
+    def memory_usage(self) -> int:
+        return sum(r.memory_bytes for r in list(self._galleries.values()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            galleries = [
+                {
+                    "path": key,
+                    "embeddings": len(rec._cache),
+                    "memory_mb": round(rec.memory_bytes / 1024 / 1024, 2),
+                    "active": key == self.active_path,
+                }
+                for key, rec in reversed(self._galleries.items())
+            ]
+        return {
+            "model_name": self.model_name,
+            "match_mode": self.match_mode,
+            "memory_budget_mb": round(self.memory_budget / 1024 / 1024, 1),
+            "memory_used_mb": round(sum(g["memory_mb"] for g in galleries), 2),
+            "galleries": galleries,
+            "loading": sorted(self._loading),
+        }
+
+    # ── Helpers ──────────────────────────────────────────────────
+
+    def _evict(self):
+        """Drops LRU galleries until under budget. Caller holds the lock."""
+        while len(self._galleries) > 1 and self.memory_usage() > self.memory_budget:
+            newest = next(reversed(self._galleries))
+            victim = next(
+                (k for k in self._galleries if k not in (newest, self.active_path)),
+                None,
+            )
+            if victim is None:
+                break
+            del self._galleries[victim]
+            print(f"[galleries] Evicted {victim} (memory budget exceeded)")
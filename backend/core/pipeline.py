@@ -0,0 +1,41 @@
+import cv2
+import numpy as np
+
+
+def downscale(frame: np.ndarray, max_width: int = 640) -> tuple[np.ndarray, float]:
+    h, w = frame.shape[:2]
+    if w <= max_width:
+        return frame, 1.0
+    scale = max_width / w
+    new_size = (max_width, int(h * scale))
+    return cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA), scale
+
+
+def extract_faces(rgb_frame: np.ndarray, detections: list, scale: float, quality_gate=None) -> list[dict]:
+    """
+    Turns MTCNN *detections* made on a frame downscaled by *scale* into
+    full-resolution crops of confident faces (> 0.9), scored by *quality_gate*.
+    """
+    valid_faces: list[dict] = []
+    for face_obj in detections:
+        confidence = face_obj["confidence"]
+        if confidence <= 0.9:
+            continue
+        x, y, w, h = face_obj["box"]
+        ox, oy = max(0, int(x / scale)), max(0, int(y / scale))
+        ow, oh = int(w / scale), int(h / scale)
+        face_crop = rgb_frame[oy : oy + oh, ox : ox + ow]
+        if face_crop.size == 0:
+            continue
+        quality = (
+            quality_gate.assess(face_crop, face_obj.get("keypoints"))
+            if quality_gate is not None
+            else {"ok": True, "reasons": []}
+        )
+        valid_faces.append({
+            "crop": face_crop,
+            "confidence": confidence,
+            "box": {"x": ox, "y": oy, "w": ow, "h": oh},
+            "quality": quality,
+        })
+    return valid_faces
@@ -0,0 +1,182 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+
+class PipelineProfiler:
+    """
+    On-demand cProfile + tracemalloc capture for the recognition pipeline.
+
+    The profiler is idle by default: ``call()`` is a plain passthrough until
+    ``start()`` is invoked, so regular traffic only pays one attribute check.
+    While a session is active, every wrapped call gets its own
+    ``cProfile.Profile`` on the thread that runs it (event loop or ``_pool``
+    worker) and the resulting stats are merged into the session when the
+    call returns.  The session ends after *max_requests* frames or
+    *duration* seconds, whichever comes first.
+    """
+
+    def __init__(self, output_dir="profiles"):
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+        self._session: dict | None = None
+        self._timer: threading.Timer | None = None
+        self.last_report: dict | None = None
+
+    @property
+    def is_active(self) -> bool:
+        return self._session is not None
+
+    # ── Session control ─────────────────────────────────────────
+
+    def start(self, max_requests=None, duration=None, trace_memory=True, top=40):
+        """Begin a capture session. Raises ``RuntimeError`` if one is running."""
+        if not max_requests and not duration:
+            raise ValueError("max_requests or duration is required")
+
+        with self._lock:
+            if self._session is not None:
+                raise RuntimeError("A profiling session is already running")
+
+            owns_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+            if owns_tracemalloc:
+                tracemalloc.start(25)
+
+            self._session = {
+                "started_at": datetime.utcnow(),
+                "t0": time.perf_counter(),
+                "max_requests": max_requests,
+                "duration": duration,
+                "requests": 0,
+                "stats": None,
+                "stages": {},
+                "top": top,
+                "trace_memory": trace_memory,
+                "owns_tracemalloc": owns_tracemalloc,
+                "snapshot": tracemalloc.take_snapshot() if trace_memory else None,
+            }
+
+        if duration:
+            self._timer = threading.Timer(duration, self.stop)
+            self._timer.daemon = True
+            self._timer.start()
+
+        print(f"[profiler] Session started (requests={max_requests}, seconds={duration})")
+
+    def stop(self) -> dict | None:
+        """End the current session and return its report (``None`` if idle)."""
+        with self._lock:
+            session = self._session
+            self._session = None
+            timer, self._timer = self._timer, None
+
+        if session is None:
+            return None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+
+        report = self._build_report(session)
+        self.last_report = report
+        print(f"[profiler] Session finished: {report['requests']} requests profiled")
+        return report
+
+    def status(self) -> dict:
+        session = self._session
+        if session is None:
+            return {"active": False, "last_report": self.last_report}
+        return {
+            "active": True,
+            "requests": session["requests"],
+            "max_requests": session["max_requests"],
+            "elapsed_s": round(time.perf_counter() - session["t0"], 3),
+            "duration_s": session["duration"],
+        }
+
+    # ── Instrumentation hooks ───────────────────────────────────
+
+    def call(self, stage: str, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)``, profiling it if a session is active."""
+        session = self._session
+        if session is None:
+            return fn(*args, **kwargs)
+
+        prof = cProfile.Profile()
+        t0 = time.perf_counter()
+        try:
+            return prof.runcall(fn, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                if session["stats"] is None:
+                    session["stats"] = pstats.Stats(prof)
+                else:
+                    session["stats"].add(prof)
+                calls, total = session["stages"].get(stage, (0, 0.0))
+                session["stages"][stage] = (calls + 1, total + elapsed)
+
+    def request_done(self):
+        """Count one finished frame and close the session once the budget is spent."""
+        session = self._session
+        if session is None:
+            return
+        with self._lock:
+            session["requests"] += 1
+            done = (
+                session["max_requests"] is not None
+                and session["requests"] >= session["max_requests"]
+            )
+        if done and self._session is session:
+            self.stop()
+
+    # ── Helpers ─────────────────────────────────────────────────
+
+    def _build_report(self, session: dict) -> dict:
+        stages = {
+            name: {
+                "calls": calls,
+                "total_ms": round(total * 1000, 2),
+                "mean_ms": round(total * 1000 / calls, 2) if calls else 0.0,
+            }
+            for name, (calls, total) in session["stages"].items()
+        }
+
+        top_functions = ""
+        profile_file = None
+        stats = session["stats"]
+        if stats is not None:
+            buf = io.StringIO()
+            stats.stream = buf
+            stats.sort_stats("cumulative").print_stats(session["top"])
+            top_functions = buf.getvalue()
+
+            os.makedirs(self.output_dir, exist_ok=True)
+            timestamp = session["started_at"].strftime("%Y%m%d_%H%M%S")
+            profile_file = os.path.join(self.output_dir, f"profile_{timestamp}.prof")
+            try:
+                stats.dump_stats(profile_file)
+            except Exception as e:
+                print(f"[profiler] Failed to save profile: {e}")
+                profile_file = None
+
+        memory: list[str] = []
+        if session["trace_memory"] and tracemalloc.is_tracing():
+            after = tracemalloc.take_snapshot()
+            diff = after.compare_to(session["snapshot"], "lineno")
+            memory = [str(entry) for entry in diff[:session["top"]]]
+            if session["owns_tracemalloc"]:
+                tracemalloc.stop()
+
+        return {
+            "started_at": session["started_at"].isoformat(),
+            "elapsed_s": round(time.perf_counter() - session["t0"], 3),
+            "requests": session["requests"],
+            "stages": stages,
+            "top_functions": top_functions,
+            "memory_top": memory,
+            "profile_file": profile_file,
+        }
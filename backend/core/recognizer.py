@@ -1,7 +1,26 @@
 import os
 import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from deepface import DeepFace
+
+from .compaction import normalize, prototypes as build_identity_prototypes
+
+
+# Embedding models supported by DeepFace, with the cosine-distance threshold
+# used when none is given to ``find_identity``.  VGG-Face keeps the value tuned
+# for this project; the others start from DeepFace's published thresholds.
+SUPPORTED_MODELS = {
+    "VGG-Face": 0.20,
+    "Facenet": 0.40,
+    "Facenet512": 0.30,
+    "ArcFace": 0.68,
+    "SFace": 0.593,
+    "GhostFaceNet": 0.65,
+    "OpenFace": 0.10,
+    "DeepID": 0.015,
+    "Dlib": 0.07,
+}
 
 
 class FaceRecognizer:
@@ -11,23 +30,73 @@ class FaceRecognizer:
     We pre-compute embeddings for every registered identity at startup and compare
     new face crops against the cache using cosine distance.  This brings per-face
     recognition cost from ~500 ms down to ~5 ms.
+
+    DeepFace (and with it TensorFlow) is imported on first use.  Pass
+    ``preload=False`` to skip building the cache in the constructor and call
+    ``load_cache()`` / ``warmup()`` later, e.g. from a background thread.
+
+    The on-disk cache is kept per model (``embeddings_cache_<model>.pkl``) and
+    records the image files it was built from, so switching models never
+    compares against embeddings from a different network.
+
+    With ``match_mode="prototypes"`` queries are compared against up to
+    ``prototypes`` representative embeddings per identity instead of every
+    enrolled image (see ``backend.core.compaction``).
     """
 
-    def __init__(self, db_path=None, model_name="VGG-Face"):
+    def __init__(
+        self,
+        db_path=None,
+        model_name="VGG-Face",
+        preload=True,
+        threshold=None,
+        match_mode="all",
+        prototypes=3,
+    ):
+        if model_name not in SUPPORTED_MODELS:
+            raise ValueError(f"Unsupported model '{model_name}'")
+        if match_mode not in ("all", "prototypes"):
+            raise ValueError(f"Unsupported match mode '{match_mode}'")
+        self.match_mode = match_mode
+        self.prototypes = prototypes
         self.db_path = db_path
         self.model_name = model_name
+        self.threshold = threshold if threshold is not None else SUPPORTED_MODELS[model_name]
         # Each entry: {"name": str, "embedding": np.ndarray, "path": str}
         self._cache: list[dict] = []
+        # Every image the cache accounts for (embedded or not): {path: mtime}
+        self._files: dict[str, float] = {}
+        # Serialises cache writers (loads, rebuilds, incremental adds/removals);
+        # re-entrant because load_cache falls back to reload_db
+        self._write_lock = threading.RLock()
+        # (names, unit-norm matrix) that find_identity matches against; rebuilt
+        # by the writers under _write_lock, never on the request path
+        self._matrix: tuple[list[str], np.ndarray] | None = None
+        # Prototype rows per identity (prototypes mode), so a write only
+        # re-clusters the identities it touched
+        self._protos: dict[str, np.ndarray] = {}
 
         if self.db_path and not os.path.exists(self.db_path):
             os.makedirs(self.db_path)
 
-        if self.db_path:
+        if self.db_path and preload:
             self.load_cache()
 
     @property
     def _cache_file(self):
-        return os.path.join(self.db_path, "embeddings_cache.pkl") if self.db_path else None
+        if not self.db_path:
+            return None
+        slug = self.model_name.lower().replace("-", "")
+        return os.path.join(self.db_path, f"embeddings_cache_{slug}.pkl")
+
+    @property
+    def memory_bytes(self) -> int:
+        matrix = self._matrix[1].nbytes if self._matrix is not None else 0
+        return sum(c["embedding"].nbytes for c in self._cache) + matrix
+
+    @property
+    def embedding_size(self) -> int | None:
+        return int(self._cache[0]["embedding"].shape[0]) if self._cache else None
 
     # ── Public API ───────────────────────────────────────────────
 
@@ -35,7 +104,15 @@ class FaceRecognizer:
         """
         Loads embeddings from the file cache if it exists and is up to date.
         Otherwise, rebuilds the database by calling reload_db().
+
+        Holds the write lock throughout, so an incremental add that finishes
+        meanwhile is applied on top of the loaded cache instead of being
+        overwritten by it.
         """
+        with self._write_lock:
+            self._load_cache()
+
+    def _load_cache(self):
         cache_file = self._cache_file
 
         if not cache_file or not os.path.exists(cache_file):
@@ -43,35 +120,32 @@ class FaceRecognizer:
             self.reload_db()
             return
 
-        # Check if database has been modified since cache was created
-        cache_mtime = os.path.getmtime(cache_file)
-        needs_reload = False
-
-        for root, _, files in os.walk(self.db_path):
-            if os.path.getmtime(root) > cache_mtime:
-                needs_reload = True
-                break
-            for file in files:
-                if self._is_image(file):
-                    file_path = os.path.join(root, file)
-                    if os.path.getmtime(file_path) > cache_mtime:
-                        needs_reload = True
-                        break
-            if needs_reload:
-                break
-
-        if needs_reload:
+        try:
+            with open(cache_file, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            print(f"[recognizer] Error loading cache file: {e}. Rebuilding...")
+            self.reload_db()
+            return
+
+        # The cache is valid only for the same model and the same set of images
+        if (
+            not isinstance(payload, dict)
+            or payload.get("model") != self.model_name
+            or payload.get("files") != self._scan_images()
+        ):
             print("[recognizer] Database modified. Rebuilding cache...")
             self.reload_db()
-        else:
-            try:
-                assert cache_file is not None
-                with open(cache_file, "rb") as f:
-                    self._cache = pickle.load(f)
-                print(f"[recognizer] Loaded {len(self._cache)} embeddings from file cache.")
-            except Exception as e:
-                print(f"[recognizer] Error loading cache file: {e}. Rebuilding...")
-                self.reload_db()
+            return
+
+        self._files = payload["files"]
+        self._publish(payload["entries"])
+        print(f"[recognizer] Loaded {len(self._cache)} {self.model_name} embeddings from file cache.")
+
+    def warmup(self):
+        """Builds the embedding model and runs one dummy forward pass."""
+        self._represent_crop(np.zeros((224, 224, 3), dtype=np.uint8))
+        print(f"[recognizer] {self.model_name} warmed up.")
 
     def reload_db(self):
         """
@@ -80,75 +154,137 @@ class FaceRecognizer:
         """
         cache: list[dict] = []
         if not os.path.exists(self.db_path):
-            self._cache = cache
+            with self._write_lock:
+                self._publish(cache)
             return
 
-        for person_name in sorted(os.listdir(self.db_path)):
-            person_dir = os.path.join(self.db_path, person_name)
-            if not os.path.isdir(person_dir):
-                continue
-            for img_file in os.listdir(person_dir):
-                img_path = os.path.join(person_dir, img_file)
-                if not self._is_image(img_path):
-                    continue
+        with self._write_lock:
+            files = self._scan_images()
+            for img_path in files:
                 try:
-                    reps = DeepFace.represent(
-                        img_path=img_path,
-                        model_name=self.model_name,
-                        detector_backend="mtcnn",  # DB images are full photos, need detection
-                        enforce_detection=False,
-                    )
-                    if reps:
-                        emb = np.array(reps[0]["embedding"], dtype=np.float32)
-                        cache.append(
-                            {"name": person_name, "embedding": emb, "path": img_path}
-                        )
+                    emb = self._represent(img_path)
+                    if emb is not None:
+                        cache.append(self._entry(img_path, emb))
                 except Exception as e:
                     print(f"[recognizer] skip {img_path}: {e}")
 
-        self._cache = cache
-        cache_file = self._cache_file
-        if cache_file:
-            try:
-                with open(cache_file, "wb") as f:
-                    pickle.dump(self._cache, f)
-                print(f"[recognizer] Cache saved to {cache_file}")
-            except Exception as e:
-                print(f"[recognizer] Failed to save cache file: {e}")
+            self._files = files
+            self._publish(cache)
+            self._save_cache()
 
         print(f"[recognizer] Cache loaded: {len(cache)} embeddings for "
               f"{len(set(c['name'] for c in cache))} identities")
 
-    def find_identity(self, face_crop: np.ndarray, threshold: float = 0.20):
+    def add_images(
+        self, img_paths: list[str], max_workers: int = 4, on_progress=None, save: bool = True
+    ) -> int:
+        """
+        Embeds *img_paths* (already saved under ``db_path/<identity>/``) in
+        parallel and appends them to the cache without a full rebuild.
+        With ``save=False`` the file cache is left for a later ``save_cache()``,
+        so callers adding many batches write it once.
+
+        *on_progress* is called as ``on_progress(path, error)`` after each
+        image, with ``error`` set to ``None`` on success.  Returns the number
+        of embeddings added.
+        """
+        def _embed(img_path):
+            try:
+                emb = self._represent(img_path)
+                error = None if emb is not None else "No face embedding produced"
+            except Exception as e:
+                emb, error = None, str(e)
+            if on_progress is not None:
+                on_progress(img_path, error)
+            return img_path, emb
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_embed, img_paths))
+
+        added = [self._entry(path, emb) for path, emb in results if emb is not None]
+        replaced = set(img_paths)
+        with self._write_lock:
+            changed = {c["name"] for c in self._cache if c["path"] in replaced}
+            changed.update(c["name"] for c in added)
+            self._publish([c for c in self._cache if c["path"] not in replaced] + added, changed)
+            for path in img_paths:
+                if os.path.exists(path):
+                    self._files[path] = os.path.getmtime(path)
+            if save:
+                self._save_cache()
+        return len(added)
+
+    def sync_with_disk(self, max_workers: int = 4) -> tuple[int, int]:
+        """
+        Catches the cache up with ``db_path``: images added or modified since
+        the cache was built are embedded, and deleted ones are dropped.  Used
+        after a long load, when writes may have gone to another recognizer.
+        Returns ``(added, removed)``.
+        """
+        if not os.path.exists(self.db_path):
+            return 0, 0
+        on_disk = self._scan_images()
+        with self._write_lock:
+            known = dict(self._files)
+        stale = [p for p, mtime in on_disk.items() if known.get(p) != mtime]
+        gone = [p for p in known if p not in on_disk]
+        if gone:
+            self.remove_images(gone)
+        if stale:
+            self.add_images(stale, max_workers=max_workers)
+        return len(stale), len(gone)
+
+    def save_cache(self):
+        """Writes the current cache to its file."""
+        with self._write_lock:
+            self._save_cache()
+
+    def remove_identity(self, name: str):
+        """Drops every cached embedding of *name* (its folder is already gone)."""
+        with self._write_lock:
+            self._publish([c for c in self._cache if c["name"] != name], {name})
+            self._files = {
+                p: m for p, m in self._files.items()
+                if os.path.basename(os.path.dirname(p)) != name
+            }
+            self._save_cache()
+
+    def remove_images(self, img_paths: list[str]):
+        """Drops the cached embeddings of *img_paths* (already moved or deleted)."""
+        removed = set(img_paths)
+        with self._write_lock:
+            changed = {c["name"] for c in self._cache if c["path"] in removed}
+            self._publish([c for c in self._cache if c["path"] not in removed], changed)
+            self._files = {p: m for p, m in self._files.items() if p not in removed}
+            self._save_cache()
+
+    def find_identity(self, face_crop: np.ndarray, threshold: float | None = None):
         """
         Compute the embedding for *face_crop* (an RGB numpy array that already
         contains a detected face) and compare against the cached database
         embeddings using cosine distance.
 
         Returns ``(name, distance)`` where *distance* ≤ *threshold* means match.
-        Threshold is cosine distance (0 = identical, 1 = orthogonal).
+        Threshold is cosine distance (0 = identical, 1 = orthogonal) and
+        defaults to ``self.threshold``.
         """
-        if not self._cache:
+        if threshold is None:
+            threshold = self.threshold
+        gallery = self._matrix
+        if gallery is None or not gallery[0]:
             return "Unknown", 1.0
 
         try:
-            reps = DeepFace.represent(
-                img_path=face_crop,
-                model_name=self.model_name,
-                detector_backend="skip",  # face already cropped by MTCNN
-                enforce_detection=False,
-            )
-            if not reps:
+            query_emb = self._represent_crop(face_crop)
+            if query_emb is None:
                 return "Unknown", 1.0
-
-            query_emb = np.array(reps[0]["embedding"], dtype=np.float32)
         except Exception as e:
             print(f"[recognizer] Error computing embedding: {e}")
             return "Unknown", 1.0
 
-        # Vectorised cosine distance against all cached embeddings
-        db_matrix = np.stack([c["embedding"] for c in self._cache])  # (M, D)
-        distances = self._cosine_distances(query_emb, db_matrix)     # (M,)
+        # Vectorised cosine distance against the (pre-normalised) gallery
+        names, db_matrix = gallery                          # (M, D)
+        distances = 1.0 - db_matrix @ normalize(query_emb)  # (M,)
 
         best_idx = int(np.argmin(distances))
         best_dist = float(distances[best_idx])
@@ -156,18 +292,92 @@ class FaceRecognizer:
         #print(best_dist, threshold, best_dist <= threshold)
         
         if best_dist <= threshold:
-            return self._cache[best_idx]["name"], best_dist
+            return names[best_idx], best_dist
         return "Unknown", best_dist
 
     # ── Helpers ──────────────────────────────────────────────────
 
+    def _represent(self, img_path: str) -> np.ndarray | None:
+        from deepface import DeepFace
+
+        reps = DeepFace.represent(
+            img_path=img_path,
+            model_name=self.model_name,
+            detector_backend="mtcnn",  # DB images are full photos, need detection
+            enforce_detection=False,
+        )
+        return np.array(reps[0]["embedding"], dtype=np.float32) if reps else None
+
+    def _represent_crop(self, face_crop: np.ndarray) -> np.ndarray | None:
+        from deepface import DeepFace
+
+        reps = DeepFace.represent(
+            img_path=face_crop,
+            model_name=self.model_name,
+            detector_backend="skip",  # face already cropped by MTCNN
+            enforce_detection=False,
+        )
+        return np.array(reps[0]["embedding"], dtype=np.float32) if reps else None
+
     @staticmethod
-    def _cosine_distances(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
-        """Return cosine distances between *query* (1‑D) and each row of *matrix*."""
-        query_norm = query / (np.linalg.norm(query) + 1e-10)
-        matrix_norms = matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-10)
-        similarities = matrix_norms @ query_norm  # (M,)
-        return 1.0 - similarities
+    def _entry(img_path: str, emb: np.ndarray) -> dict:
+        return {"name": os.path.basename(os.path.dirname(img_path)), "embedding": emb, "path": img_path}
+
+    def _save_cache(self):
+        cache_file = self._cache_file
+        if not cache_file:
+            return
+        try:
+            payload = {"model": self.model_name, "files": self._files, "entries": self._cache}
+            with open(cache_file, "wb") as f:
+                pickle.dump(payload, f)
+            print(f"[recognizer] Cache saved to {cache_file}")
+        except Exception as e:
+            print(f"[recognizer] Failed to save cache file: {e}")
+
+    def _publish(self, cache: list[dict], changed: set[str] | None = None):
+        """
+        Swaps in *cache* and the matrix matched against it.  Caller holds
+        ``_write_lock``.  Readers see either the old or the new ``_matrix``,
+        never a partial update.  In prototypes mode only the identities in
+        *changed* are re-clustered (all of them when it is ``None``).
+        """
+        if self.match_mode == "prototypes":
+            if changed is None:
+                self._protos = {}
+                changed = {c["name"] for c in cache}
+            by_name: dict[str, list[np.ndarray]] = {name: [] for name in changed}
+            for c in cache:
+                if c["name"] in by_name:
+                    by_name[c["name"]].append(c["embedding"])
+            for name, embs in by_name.items():
+                if embs:
+                    self._protos[name] = build_identity_prototypes(np.stack(embs), self.prototypes)
+                else:
+                    self._protos.pop(name, None)
+            names = [name for name, rows in self._protos.items() for _ in range(len(rows))]
+            rows = list(self._protos.values())
+        else:
+            names = [c["name"] for c in cache]
+            rows = [normalize(np.stack([c["embedding"] for c in cache]))] if cache else []
+
+        matrix = np.concatenate(rows).astype(np.float32) if rows else np.empty((0, 0), np.float32)
+        self._cache = cache
+        self._matrix = (names, matrix)
+
+    def _scan_images(self) -> dict[str, float]:
+        """Returns ``{image_path: mtime}`` for every image in an identity folder."""
+        files: dict[str, float] = {}
+        for person_name in sorted(os.listdir(self.db_path)):
+            person_dir = os.path.join(self.db_path, person_name)
+            # Dot-folders hold tool output (e.g. ``.pruned``), not identities
+            if person_name.startswith(".") or not os.path.isdir(person_dir):
+                continue
+            for img_file in sorted(os.listdir(person_dir)):
+                img_path = os.path.join(person_dir, img_file)
+                if self._is_image(img_path):
+                    files[img_path] = os.path.getmtime(img_path)
+        return files
 
     @staticmethod
     def _is_image(path: str) -> bool:
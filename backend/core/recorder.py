@@ -1,18 +1,37 @@
 import cv2
+import hashlib
 import os
+import queue
+import re
+import threading
 import numpy as np
 from datetime import datetime
 
 class VideoRecorder:
-    def __init__(self, output_dir="recordings"):
+    """
+    One recording session.  ``add_frame`` only enqueues; a dedicated writer
+    thread owns the ``cv2.VideoWriter``, so encoding never runs on the request
+    path and several sessions encode in parallel (OpenCV releases the GIL
+    while encoding).  When the writer falls behind and the queue is full,
+    frames are dropped rather than stalling recognition.
+    """
+
+    def __init__(self, output_dir="recordings", camera_id=None, fps=10.0, queue_size=64):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        self.camera_id = camera_id
+        self.fps = fps
         self.is_recording = False
         self.writer = None
         self.current_file = None
         self.start_time = None
+        self.recording_id = None
         self.width = None
         self.height = None
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
 
     def start(self):
         """Prepares the recorder, but waits for the first frame to init VideoWriter."""
@@ -20,28 +39,45 @@ class VideoRecorder:
             return
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.current_file = os.path.join(self.output_dir, f"rec_{timestamp}.mp4")
+        prefix = f"rec_{_safe_name(self.camera_id)}_" if self.camera_id else "rec_"
+        self.current_file = _reserve(self.output_dir, f"{prefix}{timestamp}")
         self.is_recording = True
         self.start_time = datetime.utcnow()
         self.writer = None # Will be init on first frame
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
         print(f"[VideoRecorder] Recording session enabled: {self.current_file}")
 
     def add_frame(self, frame_bgr: np.ndarray):
         if not self.is_recording:
             return
+        try:
+            self._queue.put_nowait(frame_bgr)
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def _write_loop(self):
+        while True:
+            frame_bgr = self._queue.get()
+            if frame_bgr is None:
+                break
+            self._write(frame_bgr)
 
+    def _write(self, frame_bgr: np.ndarray):
         h, w = frame_bgr.shape[:2]
         
         # Lazy init writer with actual frame dimensions
         if self.writer is None:
             # Try AVC1 (H.264) for browser compatibility, fallback to MP4V
             fourcc = cv2.VideoWriter_fourcc(*'avc1')
-            self.writer = cv2.VideoWriter(self.current_file, fourcc, 10.0, (w, h))
+            self.writer = cv2.VideoWriter(self.current_file, fourcc, self.fps, (w, h))
             
             if not self.writer.isOpened():
                 print("[VideoRecorder] Warning: avc1 codec failed, falling back to mp4v")
                 fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                self.writer = cv2.VideoWriter(self.current_file, fourcc, 10.0, (w, h))
+                self.writer = cv2.VideoWriter(self.current_file, fourcc, self.fps, (w, h))
             
             self.width, self.height = w, h
             print(f"[VideoRecorder] Initialized VideoWriter: {w}x{h}")
@@ -51,6 +87,7 @@ class VideoRecorder:
             frame_bgr = cv2.resize(frame_bgr, (self.width, self.height))
 
         self.writer.write(frame_bgr)
+        self.frames_written += 1
 
     def stop(self):
         if not self.is_recording:
@@ -60,9 +97,16 @@ class VideoRecorder:
         start_time = self.start_time
         
         self.is_recording = False
+        # Let the writer thread drain the queue before closing the file
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
         if self.writer:
             self.writer.release()
             self.writer = None
+        elif file_path and os.path.exists(file_path) and os.path.getsize(file_path) == 0:
+            # No frame arrived: drop the placeholder reserved by start()
+            os.remove(file_path)
         
         end_time = datetime.utcnow()
         
@@ -102,3 +146,84 @@ class VideoRecorder:
         self.height = None
         
         return file_path, start_time, end_time
+
+
+def _safe_name(camera_id: str) -> str:
+    """
+    File-name-safe form of *camera_id*.  Cleaning is lossy (``gate/1`` and
+    ``gate:1`` both give ``gate_1``), so a short hash of the raw id is appended.
+    """
+    digest = hashlib.sha1(camera_id.encode("utf-8")).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9_-]', '_', camera_id)[:40]}_{digest}"
+
+
+def _reserve(output_dir: str, stem: str) -> str:
+    """
+    Creates an empty ``<stem>.mp4`` in *output_dir* with ``O_EXCL`` and returns
+    its path, adding ``_<n>`` when the name is taken (e.g. a camera restarted
+    within the same second), so two sessions never share an output file.
+    """
+    n = 0
+    while True:
+        path = os.path.join(output_dir, f"{stem}_{n}.mp4" if n else f"{stem}.mp4")
+        try:
+            with open(path, "xb"):
+                return path
+        except FileExistsError:
+            n += 1
+
+
+class RecordingSessions:
+    """
+    Concurrent recording sessions keyed by camera (or client) id.  Every
+    session has its own ``VideoRecorder``, so it has its own writer thread,
+    frame size and output file.
+    """
+
+    def __init__(self, output_dir="recordings", fps=10.0):
+        self.output_dir = output_dir
+        self.fps = fps
+        self._sessions: dict[str, VideoRecorder] = {}
+        self._lock = threading.Lock()
+
+    def get(self, camera_id: str) -> VideoRecorder | None:
+        """The active session for *camera_id*, if any."""
+        return self._sessions.get(camera_id)
+
+    def start(self, camera_id: str) -> VideoRecorder:
+        """Starts (or returns the already running) session for *camera_id*."""
+        with self._lock:
+            recorder = self._sessions.get(camera_id)
+            if recorder is None:
+                recorder = VideoRecorder(self.output_dir, camera_id=camera_id, fps=self.fps)
+                recorder.start()
+                self._sessions[camera_id] = recorder
+            return recorder
+
+    def stop(self, camera_id: str) -> tuple[VideoRecorder | None, tuple]:
+        """
+        Stops the session for *camera_id*.  Returns the recorder (``None`` if
+        there was no session) and ``(file_path, start_time, end_time)``.
+        Blocks while the file is finalised, so call it off the event loop.
+        """
+        with self._lock:
+            recorder = self._sessions.pop(camera_id, None)
+        if recorder is None:
+            return None, (None, None, None)
+        return recorder, recorder.stop()
+
+    def stop_all(self) -> list[tuple[VideoRecorder, tuple]]:
+        return [self.stop(camera_id) for camera_id in list(self._sessions)]
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "camera": camera_id,
+                "id": rec.recording_id,
+                "file": os.path.basename(rec.current_file) if rec.current_file else None,
+                "size": [rec.width, rec.height] if rec.width else None,
+                "frames_written": rec.frames_written,
+                "frames_dropped": rec.frames_dropped,
+            }
+            for camera_id, rec in list(self._sessions.items())
+        ]
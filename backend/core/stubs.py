@@ -0,0 +1,82 @@
+import hashlib
+import time
+
+import numpy as np
+
+from .detector import FaceDetector
+from .recognizer import FaceRecognizer
+
+# Output size of each supported model, so gallery matching costs what it would
+STUB_EMBEDDING_SIZES = {
+    "VGG-Face": 4096,
+    "Facenet": 128,
+    "Facenet512": 512,
+    "ArcFace": 512,
+    "SFace": 128,
+    "GhostFaceNet": 512,
+    "OpenFace": 128,
+    "DeepID": 160,
+    "Dlib": 128,
+}
+
+
+class StubFaceDetector(FaceDetector):
+    """
+    MTCNN stand-in for load testing without TensorFlow or a GPU.  Sleeps
+    *latency_ms* per frame and reports one frontal face centred in the frame.
+    """
+
+    def __init__(self, latency_ms: float = 30.0):
+        super().__init__()
+        self.latency_ms = latency_ms
+
+    @property
+    def is_loaded(self) -> bool:
+        return True
+
+    def detect_faces(self, frame):
+        time.sleep(self.latency_ms / 1000)
+        h, w = frame.shape[:2]
+        size = min(h, w) // 3
+        x, y = (w - size) // 2, (h - size) // 2
+        return [{
+            "box": [x, y, size, size],
+            "confidence": 0.99,
+            "keypoints": {
+                "left_eye": (x + size * 0.3, y + size * 0.4),
+                "right_eye": (x + size * 0.7, y + size * 0.4),
+                "nose": (x + size * 0.5, y + size * 0.6),
+                "mouth_left": (x + size * 0.35, y + size * 0.8),
+                "mouth_right": (x + size * 0.65, y + size * 0.8),
+            },
+        }]
+
+    def warmup(self):
+        print("[FaceDetector] Using stub detector.")
+
+
+class StubFaceRecognizer(FaceRecognizer):
+    """
+    ``FaceRecognizer`` whose embeddings are deterministic pseudo-random vectors
+    of the configured model's size, after sleeping *latency_ms*.  Caching,
+    gallery matching and enrollment run the real code paths.
+    """
+
+    latency_ms: float = 20.0
+
+    @property
+    def _cache_file(self):
+        # Never persist fake embeddings next to the real per-model caches
+        return None
+
+    def _fake_embedding(self, key: bytes) -> np.ndarray:
+        time.sleep(self.latency_ms / 1000)
+        seed = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+        dim = STUB_EMBEDDING_SIZES[self.model_name]
+        return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+    def _represent(self, img_path: str) -> np.ndarray | None:
+        return self._fake_embedding(img_path.encode())
+
+    def _represent_crop(self, face_crop: np.ndarray) -> np.ndarray | None:
+        return self._fake_embedding(face_crop[::8, ::8].tobytes())
@@ -0,0 +1,245 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import cv2
+from sqlmodel import Session, select
+
+from ..db import engine, RecognitionLog, VideoRecording
+from .pipeline import downscale, extract_faces
+
+
+class VideoAnalyzer:
+    """
+    Offline detection + recognition over a video file.
+
+    Decoding is sequential, and frames between samples are only ``grab()``-ed
+    (never converted), so decoding keeps pace with *sample_fps*.  Sampled
+    frames are analysed on a thread pool sized to the CPU count by default.
+    TensorFlow releases the GIL inside MTCNN and DeepFace, so the threads keep
+    every core busy while sharing one copy of each model.  At most
+    ``2 * workers`` frames are in flight, which bounds memory for footage of
+    any length.  The same bound keeps cancellation quick: once *should_stop*
+    returns true, queued frames are cancelled and only the ones already on a
+    worker are awaited.
+    """
+
+    def __init__(self, detector, recognizer, quality_gate=None, sample_fps=2.0, workers=None):
+        self.detector = detector
+        self.recognizer = recognizer
+        self.quality_gate = quality_gate
+        self.sample_fps = sample_fps
+        self.workers = workers or os.cpu_count() or 4
+
+    def analyze_frame(self, frame_bgr) -> list[tuple[str, float]]:
+        """Returns ``[(name, similarity), ...]`` for the usable faces in one frame."""
+        rgb_frame = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        small_frame, scale = downscale(rgb_frame, max_width=640)
+        detections = self.detector.detect_faces(small_frame)
+
+        results = []
+        for face in extract_faces(rgb_frame, detections, scale, self.quality_gate):
+            if not face["quality"]["ok"]:
+                continue
+            name, distance = self.recognizer.find_identity(face["crop"])
+            results.append((name, round(float(1 - distance), 3)))
+        return results
+
+    def run(self, video_path: str, on_progress=None, should_stop=None) -> dict:
+        """
+        Analyses *video_path*.  *on_progress* is called as
+        ``on_progress(frames_read, frames_total, frames_sampled)``.  When
+        *should_stop* returns true the analysis ends early and the summary has
+        ``"cancelled": True``.
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video '{video_path}'")
+
+        src_fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        frames_total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
+        step = max(1, round(src_fps / self.sample_fps))
+
+        detections: list[tuple[float, str, float]] = []
+        pending: deque = deque()
+
+        def _collect():
+            offset, future = pending.popleft()
+            detections.extend((offset, name, sim) for name, sim in future.result())
+
+        t0 = time.perf_counter()
+        index = sampled = 0
+        cancelled = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while True:
+                    if should_stop is not None and should_stop():
+                        cancelled = True
+                        for _, future in pending:
+                            future.cancel()
+                        pending.clear()
+                        break
+                    if index % step == 0:
+                        ok, frame = cap.read()
+                        if not ok:
+                            break
+                        pending.append((index / src_fps, pool.submit(self.analyze_frame, frame)))
+                        sampled += 1
+                        while len(pending) >= 2 * self.workers:
+                            _collect()
+                    elif not cap.grab():
+                        break
+                    index += 1
+                    if on_progress is not None and index % 100 == 0:
+                        on_progress(index, frames_total, sampled)
+                while pending:
+                    _collect()
+        finally:
+            cap.release()
+
+        elapsed = time.perf_counter() - t0
+        if on_progress is not None:
+            on_progress(index, frames_total, sampled)
+        return {
+            "frames_total": index,
+            "frames_sampled": sampled,
+            "duration_s": round(index / src_fps, 2),
+            "elapsed_s": round(elapsed, 2),
+            "fps": round(sampled / elapsed, 2) if elapsed else 0.0,
+            "realtime_factor": round(index / src_fps / elapsed, 2) if elapsed else 0.0,
+            "detections": detections,
+            "cancelled": cancelled,
+        }
+
+
+def save_results(video_path: str, summary: dict, start_time: datetime | None = None) -> int:
+    """
+    Stores the detections of ``VideoAnalyzer.run`` as ``RecognitionLog`` rows
+    linked to the ``VideoRecording`` of *video_path*.  The recording row is
+    created if the file is not one of ours.  Its start time then defaults to
+    the file's modification time minus its duration.  Returns the recording id.
+    """
+    abs_path = os.path.abspath(video_path)
+    duration = timedelta(seconds=summary["duration_s"])
+
+    with Session(engine) as session:
+        recording = session.exec(
+            select(VideoRecording).where(VideoRecording.file_path.in_([video_path, abs_path]))
+        ).first()
+        if recording is None:
+            if start_time is None:
+                start_time = datetime.utcfromtimestamp(os.path.getmtime(abs_path)) - duration
+            recording = VideoRecording(
+                file_path=abs_path, start_time=start_time, end_time=start_time + duration
+            )
+            session.add(recording)
+            session.commit()
+            session.refresh(recording)
+
+        for offset, name, similarity in summary["detections"]:
+            session.add(RecognitionLog(
+                person_name=name,
+                confidence=similarity,
+                timestamp=recording.start_time + timedelta(seconds=offset),
+                video_id=recording.id,
+            ))
+        session.commit()
+        return recording.id
+
+
+class VideoAnalysisJobs:
+    """
+    Queue of background video analysis jobs.  Jobs run one at a time because
+    each one already spreads its frames over every core.
+
+    The runner is a daemon thread, and ``shutdown()`` cancels the running job
+    between frames, so a long analysis never holds up a restart.
+    """
+
+    def __init__(self, keep_jobs: int = 50):
+        self.keep_jobs = keep_jobs
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._runner = threading.Thread(target=self._run_jobs, daemon=True)
+        self._runner.start()
+
+    def submit(self, video_path: str, analyzer: VideoAnalyzer, start_time: datetime | None = None) -> dict:
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "status": "queued",
+            "path": video_path,
+            "created_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "sample_fps": analyzer.sample_fps,
+            "workers": analyzer.workers,
+            "frames_read": 0,
+            "frames_total": 0,
+            "frames_sampled": 0,
+            "fps": None,
+            "realtime_factor": None,
+            "detections": 0,
+            "recording_id": None,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+            while len(self._jobs) > self.keep_jobs:
+                self._jobs.popitem(last=False)
+        self._queue.put((job, analyzer, start_time))
+        return dict(job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def jobs(self) -> list[dict]:
+        with self._lock:
+            return [dict(job) for job in reversed(self._jobs.values())]
+
+    def shutdown(self, timeout: float = 10.0):
+        """Cancels the running job and every queued one, waiting up to *timeout* s."""
+        self._stop.set()
+        self._queue.put(None)
+        self._runner.join(timeout)
+
+    def _run_jobs(self):
+        while (item := self._queue.get()) is not None:
+            job = item[0]
+            if self._stop.is_set():
+                job.update(status="cancelled", finished_at=datetime.utcnow().isoformat())
+                continue
+            self._run(*item)
+
+    def _run(self, job: dict, analyzer: VideoAnalyzer, start_time: datetime | None):
+        def _progress(read, total, sampled):
+            job.update(frames_read=read, frames_total=total, frames_sampled=sampled)
+
+        job["status"] = "running"
+        try:
+            summary = analyzer.run(job["path"], on_progress=_progress, should_stop=self._stop.is_set)
+            if summary["cancelled"]:
+                job["status"] = "cancelled"
+                return
+            job["recording_id"] = save_results(job["path"], summary, start_time)
+            job.update(
+                status="done",
+                fps=summary["fps"],
+                realtime_factor=summary["realtime_factor"],
+                detections=len(summary["detections"]),
+            )
+        except Exception as e:
+            job.update(status="error", error=str(e))
+            print(f"[video] Job {job['id']} failed: {e}")
+        finally:
+            job["finished_at"] = datetime.utcnow().isoformat()
+
+        print(f"[video] Job {job['id']} {job['status']}: {job['frames_sampled']} frames "
+              f"at {job['fps']} fps")
@@ -7,9 +7,12 @@ Run from the project root (DeepSecurity/):
 """
 import sys
 import os
+import threading
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -21,29 +24,100 @@ if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
 from backend.core.detector import FaceDetector
+from backend.core.galleries import GalleryManager
 from backend.core.recognizer import FaceRecognizer
-from backend.core.recorder import VideoRecorder
-from backend.routers import recognition, faces, settings, history
-from backend.db import create_db_and_tables
+from backend.core.recorder import RecordingSessions
+from backend.core.stubs import StubFaceDetector, StubFaceRecognizer
+from backend.core.profiler import PipelineProfiler
+from backend.core.quality import FaceQualityGate
+from backend.core.admission import AdmissionController
+from backend.core.enrollment import BulkEnrollment
+from backend.core.video_analysis import VideoAnalysisJobs
+from backend.routers import recognition, faces, settings, history, profiling, enrollment, video
+from backend.db import create_db_and_tables, engine, VideoRecording
+from sqlmodel import Session
+
+
+def _load_models(app: FastAPI):
+    """
+    Imports TensorFlow/DeepFace, builds the embedding cache and runs a dummy
+    inference through both models.  Runs on a background thread so the
+    non-ML routes are served while this is in progress.
+
+    The detector goes first: it configures TF GPU memory growth, which must
+    happen before DeepFace triggers any TF operation.
+    """
+    t0 = time.perf_counter()
+    try:
+        app.state.detector.warmup()
+        app.state.recognizer.load_cache()
+        app.state.recognizer.warmup()
+    except Exception as e:
+        app.state.model_error = str(e)
+        print(f"[DeepSecurity] Model loading failed: {e}")
+        return
+    app.state.ready = True
+    print(f"[DeepSecurity] Models ready in {time.perf_counter() - t0:.1f}s.")
+
+
+def _finish_recordings(recordings: RecordingSessions):
+    """Finalises recordings still open at shutdown so their files are playable."""
+    stopped = recordings.stop_all()
+    if not stopped:
+        return
+    with Session(engine) as session:
+        for recorder, (_, _, end_time) in stopped:
+            recording = session.get(VideoRecording, recorder.recording_id) if recorder.recording_id else None
+            if recording:
+                recording.end_time = end_time
+                session.add(recording)
+        session.commit()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("[DeepSecurity] Loading AI models…")
-    
     create_db_and_tables()
     
     db_path = os.getenv("DB_PATH", os.path.join(ROOT_DIR, "db", "faces"))
     os.makedirs(db_path, exist_ok=True)
     
-    app.state.detector = FaceDetector()
-    app.state.recognizer = FaceRecognizer(db_path=db_path)
-    app.state.recorder = VideoRecorder(output_dir=os.path.join(ROOT_DIR, "recordings"))
+    app.state.ready = False
+    app.state.model_error = None
+    recognizer_cls = FaceRecognizer
+    if os.getenv("STUB_MODELS", "false").lower() == "true":
+        # Load testing without TensorFlow/GPU: fixed-latency fake models
+        StubFaceRecognizer.latency_ms = float(os.getenv("STUB_RECOGNIZE_MS", "20"))
+        recognizer_cls = StubFaceRecognizer
+        app.state.detector = StubFaceDetector(float(os.getenv("STUB_DETECT_MS", "30")))
+    else:
+        app.state.detector = FaceDetector()
+    app.state.galleries = GalleryManager(
+        model_name=os.getenv("EMBEDDING_MODEL", "VGG-Face"),
+        memory_budget_mb=float(os.getenv("GALLERY_MEMORY_MB", "512")),
+        match_mode=os.getenv("MATCH_MODE", "all"),
+        prototypes=int(os.getenv("MATCH_PROTOTYPES", "3")),
+        recognizer_cls=recognizer_cls,
+        root=os.getenv("GALLERY_ROOT", os.path.dirname(os.path.abspath(db_path))),
+    )
+    app.state.recognizer = app.state.galleries.activate(db_path, preload=False)
+    app.state.model_switch = None
+    app.state.recordings = RecordingSessions(output_dir=os.path.join(ROOT_DIR, "recordings"))
+    app.state.profiler = PipelineProfiler(output_dir=os.path.join(ROOT_DIR, "profiles"))
+    app.state.enrollment = BulkEnrollment(
+        max_workers=int(os.getenv("ENROLL_WORKERS", "4")),
+    )
+    app.state.video_jobs = VideoAnalysisJobs()
+    app.state.video_workers = int(os.getenv("VIDEO_WORKERS", "0")) or None
+    app.state.quality_gate = FaceQualityGate.from_env()
+    app.state.admission = AdmissionController.from_env()
     app.state.db_path = db_path
     
-    print(f"[DeepSecurity] Models ready (DB loaded from {db_path}).")
+    print(f"[DeepSecurity] Loading AI models in background (DB: {db_path})…")
+    threading.Thread(target=_load_models, args=(app,), daemon=True).start()
     yield
     print("[DeepSecurity] Shutting down.")
+    app.state.video_jobs.shutdown()
+    _finish_recordings(app.state.recordings)
 
 
 app = FastAPI(
@@ -67,8 +141,30 @@ app.include_router(recognition.router)
 app.include_router(faces.router)
 app.include_router(settings.router)
 app.include_router(history.router)
+app.include_router(profiling.router)
+app.include_router(enrollment.router)
+app.include_router(video.router)
 
 
 @app.get("/", tags=["health"])
-def health():
+def root():
     return {"status": "ok", "service": "DeepSecurity API v2"}
+
+
+@app.get("/health", tags=["health"])
+def health():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/ready", tags=["health"])
+def ready(request: Request):
+    """Readiness: models are loaded and warmed up, recognition can be served."""
+    state = request.app.state
+    if getattr(state, "ready", False):
+        return {"status": "ready"}
+    error = getattr(state, "model_error", None)
+    return JSONResponse(
+        status_code=503,
+        content={"status": "error" if error else "loading", "detail": error},
+    )
@@ -0,0 +1,41 @@
+import os
+import tempfile
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
+
+router = APIRouter(prefix="/api/enrollment", tags=["enrollment"])
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+@router.post("", status_code=202)
+async def bulk_enroll(request: Request, file: UploadFile = File(...)):
+    """
+    Accepts a zip or tar archive of ``identity/image`` entries and enrolls it
+    in the background into the active face database.  Returns a job whose
+    progress and per-file errors are available at ``GET /api/enrollment/{id}``.
+    """
+    suffix = "".join(os.path.splitext(file.filename or "")[1:]) or ".archive"
+    fd, archive_path = tempfile.mkstemp(prefix="enroll_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(_CHUNK_SIZE):
+                out.write(chunk)
+    except Exception as e:
+        os.remove(archive_path)
+        raise HTTPException(status_code=400, detail=f"Upload failed: {e}")
+
+    return request.app.state.enrollment.submit(archive_path, request.app.state.recognizer)
+
+
+@router.get("")
+def enrollment_jobs(request: Request):
+    """Lists recent bulk enrollment jobs (without their error reports)."""
+    return {"jobs": request.app.state.enrollment.jobs()}
+
+
+@router.get("/{job_id}")
+def enrollment_job(job_id: str, request: Request):
+    job = request.app.state.enrollment.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
@@ -3,6 +3,7 @@ import time
 import shutil
 from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from typing import List
 
 router = APIRouter(prefix="/api/faces", tags=["faces"])
@@ -12,10 +13,8 @@ def _db_path(request: Request) -> str:
     return request.app.state.db_path
 
 
-def _reload_recognizer(request: Request):
-    """Rebuild the in-memory embedding cache after DB changes."""
-    recognizer = request.app.state.recognizer
-    recognizer.reload_db()
+def _recognizer(request: Request):
+    return request.app.state.recognizer
 
 
 @router.get("")
@@ -25,7 +24,8 @@ async def faces(request: Request):
     print(db)
     os.makedirs(db, exist_ok=True)
     names = sorted(
-        d for d in os.listdir(db) if os.path.isdir(os.path.join(db, d))
+        d for d in os.listdir(db)
+        if not d.startswith(".") and os.path.isdir(os.path.join(db, d))
     )
     return {"faces": names}
 
@@ -34,7 +34,7 @@ async def faces(request: Request):
 async def face(name: str, request: Request, files: List[UploadFile] = File(...)):
     """
     Registers or extends an identity by saving one or more face images.
-    Invalidates the DeepFace representation cache after saving.
+    Only the new images are embedded and appended to the cache.
     """
     db = _db_path(request)
     os.makedirs(db, exist_ok=True)
@@ -43,18 +43,19 @@ async def face(name: str, request: Request, files: List[UploadFile] = File(...))
     os.makedirs(person_dir, exist_ok=True)
 
     saved = 0
+    paths: list[str] = []
     for upload in files:
-        content = await upload.read()
         timestamp = int(time.time() * 1000)
         ext = os.path.splitext(upload.filename)[1] if upload.filename else ".jpg"
         if not ext:
             ext = ".jpg"
         path = os.path.join(person_dir, f"face_{timestamp}_{saved}{ext}")
         with open(path, "wb") as f:
-            f.write(content)
+            await run_in_threadpool(shutil.copyfileobj, upload.file, f)
+        paths.append(path)
         saved += 1
 
-    _reload_recognizer(request)
+    await run_in_threadpool(_recognizer(request).add_images, paths)
 
     return {
         "message": f"{'Created' if is_new else 'Updated'} identity '{name}'",
@@ -70,5 +71,5 @@ def face(name: str, request: Request):
     if not os.path.exists(person_dir):
         raise HTTPException(status_code=404, detail=f"Identity '{name}' not found")
     shutil.rmtree(person_dir)
-    _reload_recognizer(request)
+    _recognizer(request).remove_identity(name)
     return JSONResponse(status_code=204, content=None)
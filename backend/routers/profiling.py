@@ -0,0 +1,48 @@
+from typing import Optional
+from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+
+router = APIRouter(prefix="/api/admin/profiling", tags=["admin"])
+
+
+class ProfileRequest(BaseModel):
+    requests: Optional[int] = None
+    seconds: Optional[float] = None
+    memory: bool = True
+
+
+@router.get("")
+def get_profiling(request: Request):
+    """Current session progress, or the last finished report when idle."""
+    return request.app.state.profiler.status()
+
+
+@router.post("", status_code=202)
+def start_profiling(body: ProfileRequest, request: Request):
+    """
+    Profiles the next ``requests`` recognition frames or the next ``seconds``
+    seconds (whichever ends first), including detector and recognizer calls
+    running on the recognition thread pool.
+    """
+    if not body.requests and not body.seconds:
+        raise HTTPException(status_code=400, detail="Set 'requests' or 'seconds'.")
+
+    profiler = request.app.state.profiler
+    try:
+        profiler.start(
+            max_requests=body.requests,
+            duration=body.seconds,
+            trace_memory=body.memory,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": "profiling_started", **profiler.status()}
+
+
+@router.post("/stop")
+def stop_profiling(request: Request):
+    """Ends the running session early and returns its aggregated report."""
+    report = request.app.state.profiler.stop()
+    if report is None:
+        raise HTTPException(status_code=404, detail="No active profiling session")
+    return report
@@ -1,13 +1,17 @@
 import os
-from fastapi import APIRouter, UploadFile, File, Request, Depends
+import time
+from fastapi import APIRouter, UploadFile, File, Request, Response, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 import asyncio
 import cv2
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
-from typing import List
-from sqlmodel import Session, select
+from typing import List, Optional
+from sqlmodel import Session
 from ..db import get_session, RecognitionLog, VideoRecording
+from ..core.admission import retry_after_header
+from ..core.pipeline import downscale, extract_faces
 from datetime import datetime
 
 router = APIRouter(prefix="/api/recognize", tags=["recognition"])
@@ -16,24 +20,134 @@ router = APIRouter(prefix="/api/recognize", tags=["recognition"])
 _pool = ThreadPoolExecutor(max_workers=4)
 
 
-def _downscale(frame: np.ndarray, max_width: int = 640) -> tuple[np.ndarray, float]:
-    h, w = frame.shape[:2]
-    if w <= max_width:
-        return frame, 1.0
-    scale = max_width / w
-    new_size = (max_width, int(h * scale))
-    return cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA), scale
+def _set_server_timing(response: Response, timings: dict[str, float]):
+    """Exposes per-stage durations (seconds) as a ``Server-Timing`` header in ms."""
+    response.headers["Server-Timing"] = ", ".join(
+        f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()
+    )
+
+
+def _reuse_key(camera: Optional[str], gallery: Optional[str]) -> Optional[str]:
+    """
+    Key under which a frame's result may be reused.  Only frames with an
+    explicit ``camera`` id get one, so clients on the shared ``default``
+    session never receive each other's faces, and results never cross galleries.
+    """
+    if not camera:
+        return None
+    return f"{camera}@{gallery}" if gallery else camera
+
+
+def _shed(admission, reuse_key: Optional[str]) -> JSONResponse | None:
+    """
+    Cheap answer for a request over the concurrency limit: the camera's last
+    result while it is still fresh, else ``None``.
+    """
+    faces = admission.recent(reuse_key) if reuse_key else None
+    if faces is None:
+        return None
+    admission.count("reused")
+    retry_after = admission.retry_after()
+    return JSONResponse(
+        content={"faces": faces, "degraded": "reused", "retry_after": retry_after},
+        headers={"Retry-After": retry_after_header(retry_after)},
+    )
 
 
 @router.post("")
 async def frame(
     request: Request, 
+    response: Response,
     file: UploadFile = File(...), 
+    gallery: Optional[str] = None,
+    camera: Optional[str] = None,
     session: Session = Depends(get_session)
 ):
-    detector = request.app.state.detector
+    """
+    Detects and recognises faces in one frame.  ``gallery`` optionally selects
+    a face database folder other than the active one.  It must be resident or
+    under ``GALLERY_ROOT``; a cold gallery is loaded in the background while
+    the request gets a ``503`` with ``Retry-After``.  ``camera`` identifies the source, so frames go
+    to that camera's recording session (``default`` when omitted).
+
+    Under overload the admission controller sheds the frame instead of
+    queueing it.  The response is then the camera's last result when an
+    explicit ``camera`` was given (``"degraded": "reused"``), detection only (``"degraded": "detection_only"``)
+    or a ``503``, each with a ``Retry-After`` hint.
+    """
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Models are still loading"},
+            headers={"Retry-After": "5"},
+        )
+
     recognizer = request.app.state.recognizer
-    recorder = request.app.state.recorder
+    if gallery:
+        galleries = request.app.state.galleries
+        if not galleries.is_allowed(gallery):
+            return JSONResponse(
+                status_code=403, content={"detail": f"Gallery '{gallery}' is outside GALLERY_ROOT"}
+            )
+        recognizer = galleries.get_resident(gallery)
+        if recognizer is None:
+            if not os.path.isdir(gallery):
+                return JSONResponse(status_code=404, content={"detail": f"Gallery '{gallery}' not found"})
+            galleries.load_in_background(gallery)
+            return JSONResponse(
+                status_code=503,
+                content={"detail": f"Gallery '{gallery}' is loading"},
+                headers={"Retry-After": "5"},
+            )
+
+    admission = request.app.state.admission
+    reuse_key = _reuse_key(camera, gallery)
+    decision = admission.admit()
+    if decision == "reject":
+        shed = _shed(admission, reuse_key)
+        if shed is not None:
+            return shed
+        admission.count("rejected")
+        retry_after = admission.retry_after()
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Overloaded", "retry_after": retry_after},
+            headers={"Retry-After": retry_after_header(retry_after)},
+        )
+    if decision == "degraded":
+        shed = _shed(admission, reuse_key)
+        if shed is not None:
+            admission.release(0.0, full=False)
+            return shed
+
+    t_start = time.perf_counter()
+    try:
+        return await _process_frame(
+            request, response, file, recognizer, camera or "default", reuse_key, session,
+            detection_only=decision == "degraded",
+        )
+    finally:
+        admission.release(time.perf_counter() - t_start, full=decision == "full")
+
+
+async def _process_frame(
+    request: Request,
+    response: Response,
+    file: UploadFile,
+    recognizer,
+    camera: str,
+    reuse_key: Optional[str],
+    session: Session,
+    detection_only: bool,
+):
+    detector = request.app.state.detector
+    recorder = request.app.state.recordings.get(camera)
+    profiler = request.app.state.profiler
+    quality_gate = request.app.state.quality_gate
+    admission = request.app.state.admission
+
+    t_start = time.perf_counter()
+    timings: dict[str, float] = {}
 
     contents = await file.read()
     nparr = np.frombuffer(contents, np.uint8)
@@ -44,53 +158,103 @@ async def frame(
 
     # MTCNN expects RGB
     rgb_frame = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-    small_frame, scale = _downscale(rgb_frame, max_width=640)
+    small_frame, scale = downscale(rgb_frame, max_width=640)
+    t_decoded = time.perf_counter()
+    timings["decode"] = t_decoded - t_start
 
-    detections = detector.detect_faces(small_frame)
+    # Off the event loop, so requests over the limit are still shed promptly
+    loop = asyncio.get_running_loop()
+    detections = await loop.run_in_executor(
+        _pool, profiler.call, "detect", detector.detect_faces, small_frame
+    )
 
-    valid_faces: list[dict] = []
-    for face_obj in detections:
-        confidence = face_obj["confidence"]
-        if confidence <= 0.9:
-            continue
-        x, y, w, h = face_obj["box"]
-        ox, oy = max(0, int(x / scale)), max(0, int(y / scale))
-        ow, oh = int(w / scale), int(h / scale)
-        face_crop = rgb_frame[oy : oy + oh, ox : ox + ow]
-        if face_crop.size == 0:
-            continue
-        valid_faces.append({
-            "crop": face_crop,
-            "confidence": confidence,
-            "box": {"x": ox, "y": oy, "w": ow, "h": oh},
-        })
+    valid_faces = extract_faces(rgb_frame, detections, scale, quality_gate)
+    t_detected = time.perf_counter()
+    timings["detect"] = t_detected - t_decoded
+
+    if detection_only:
+        # Over the limit with no recent result to reuse: boxes only, no embedding
+        admission.count("detection_only")
+        if recorder is not None:
+            recorder.add_frame(frame_bgr)
+        profiler.request_done()
+        retry_after = admission.retry_after()
+        timings["total"] = time.perf_counter() - t_start
+        _set_server_timing(response, timings)
+        response.headers["Retry-After"] = retry_after_header(retry_after)
+        return {
+            "faces": [
+                {
+                    "name": "Unknown",
+                    "confidence_detection": round(f["confidence"], 3),
+                    "similarity": 0.0,
+                    "box": f["box"],
+                    "low_quality": not f["quality"]["ok"],
+                    "quality": f["quality"],
+                    "degraded": True,
+                }
+                for f in valid_faces
+            ],
+            "degraded": "detection_only",
+            "retry_after": retry_after,
+        }
 
     if not valid_faces:
-        if recorder.is_recording:
+        if recorder is not None:
             recorder.add_frame(frame_bgr)
+        profiler.request_done()
+        timings["total"] = time.perf_counter() - t_start
+        admission.observe(timings)
+        if reuse_key:
+            admission.remember(reuse_key, [])
+        _set_server_timing(response, timings)
         return {"faces": []}
 
     # Process recognition
-    loop = asyncio.get_running_loop()
     async def _recognise(crop: np.ndarray):
-        return await loop.run_in_executor(_pool, recognizer.find_identity, crop)
+        return await loop.run_in_executor(
+            _pool, profiler.call, "recognize", recognizer.find_identity, crop
+        )
 
-    tasks = [_recognise(f["crop"]) for f in valid_faces]
-    identities = await asyncio.gather(*tasks)
+    # Low-quality crops skip the embedding forward pass entirely
+    tasks = [_recognise(f["crop"]) for f in valid_faces if f["quality"]["ok"]]
+    identities = iter(await asyncio.gather(*tasks))
+    t_recognized = time.perf_counter()
+    timings["recognize"] = t_recognized - t_detected
 
     results: List[dict] = []
-    recording_id = getattr(request.app.state, "current_recording_id", None)
+    recording_id = recorder.recording_id if recorder is not None else None
     
     # We will draw on a copy for the recorder if active
-    record_frame = frame_bgr.copy() if recorder.is_recording else None
+    record_frame = frame_bgr.copy() if recorder is not None else None
 
-    for face_info, (name, distance) in zip(valid_faces, identities):
+    for face_info in valid_faces:
+        quality = face_info["quality"]
+        if not quality["ok"]:
+            results.append({
+                "name": "Unknown",
+                "confidence_detection": round(face_info["confidence"], 3),
+                "similarity": 0.0,
+                "box": face_info["box"],
+                "low_quality": True,
+                "quality": quality,
+            })
+            if record_frame is not None:
+                box = face_info["box"]
+                bgr_color = (11, 158, 245)  # React: lowQuality #f59e0b
+                cv2.rectangle(record_frame, (box["x"], box["y"]), (box["x"] + box["w"], box["y"] + box["h"]), bgr_color, 2)
+                cv2.putText(record_frame, "Low quality", (box["x"], box["y"] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, bgr_color, 2)
+            continue
+
+        name, distance = next(identities)
         similarity = round(float(1 - distance), 3)
         results.append({
             "name": name,
             "confidence_detection": round(face_info["confidence"], 3),
             "similarity": similarity,
             "box": face_info["box"],
+            "low_quality": False,
+            "quality": quality,
         })
         
         # Log to DB
@@ -118,13 +282,21 @@ async def frame(
         recorder.add_frame(record_frame)
     
     session.commit()
+    profiler.request_done()
+    timings["persist"] = time.perf_counter() - t_recognized
+    timings["total"] = time.perf_counter() - t_start
+    admission.observe(timings)
+    if reuse_key:
+        admission.remember(reuse_key, results)
+    _set_server_timing(response, timings)
     return {"faces": results}
 
 
 @router.post("/start_recording")
-async def start_recording(request: Request, session: Session = Depends(get_session)):
-    recorder = request.app.state.recorder
-    recorder.start()
+async def start_recording(request: Request, camera: str = "default", session: Session = Depends(get_session)):
+    recorder = request.app.state.recordings.start(camera)
+    if recorder.recording_id is not None:
+        return {"status": "already_recording", "id": recorder.recording_id, "camera": camera}
     
     # Create recording entry early to have an ID for logs
     recording = VideoRecording(
@@ -135,36 +307,37 @@ async def start_recording(request: Request, session: Session = Depends(get_sessi
     session.commit()
     session.refresh(recording)
     
-    request.app.state.current_recording_id = recording.id
-    return {"status": "recording_started", "id": recording.id}
+    recorder.recording_id = recording.id
+    return {"status": "recording_started", "id": recording.id, "camera": camera}
 
 
 @router.get("/status")
-async def get_status(request: Request):
-    recorder = request.app.state.recorder
+async def get_status(request: Request, camera: str = "default"):
+    recordings = request.app.state.recordings
+    recorder = recordings.get(camera)
     return {
-        "is_recording": recorder.is_recording,
-        "current_file": os.path.basename(recorder.current_file) if recorder.current_file else None
+        "is_recording": recorder is not None,
+        "current_file": os.path.basename(recorder.current_file) if recorder else None,
+        "sessions": recordings.stats(),
+        "quality_gate": request.app.state.quality_gate.stats(),
+        "admission": request.app.state.admission.stats(),
     }
 
 
 @router.post("/stop_recording")
-async def stop_recording(request: Request, session: Session = Depends(get_session)):
-    recorder = request.app.state.recorder
-    recording_id = getattr(request.app.state, "current_recording_id", None)
-    
-    file_path, start_time, end_time = recorder.stop()
+async def stop_recording(request: Request, camera: str = "default", session: Session = Depends(get_session)):
+    # Finalising the file (writer drain + ffmpeg) must not block the event loop
+    recorder, (file_path, start_time, end_time) = await run_in_threadpool(
+        request.app.state.recordings.stop, camera
+    )
     
-    if recording_id:
-        statement = select(VideoRecording).where(VideoRecording.id == recording_id)
-        recording = session.exec(statement).first()
+    if recorder is not None and recorder.recording_id:
+        recording = session.get(VideoRecording, recorder.recording_id)
         if recording:
             recording.end_time = end_time
             session.add(recording)
             session.commit()
             session.refresh(recording)
-            request.app.state.current_recording_id = None
-            return {"status": "recording_stopped", "id": recording.id, "path": file_path}
+            return {"status": "recording_stopped", "id": recording.id, "camera": camera, "path": file_path}
     
-    request.app.state.current_recording_id = None
     return {"status": "no_active_recording"}
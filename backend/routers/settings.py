@@ -1,24 +1,108 @@
 import os
 import threading
+from typing import Optional
 from pydantic import BaseModel
 from fastapi import APIRouter, HTTPException, Request
+from ..core.galleries import GalleryManager
+from ..core.recognizer import SUPPORTED_MODELS
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
 
 class Settings(BaseModel):
-    db_path: str
+    db_path: Optional[str] = None
+    model_name: Optional[str] = None
+
+
+def _swap_recognizer(app, model_name: str):
+    """
+    Builds a recognizer for *model_name* (per-model cache + warm-up) while the
+    current one keeps serving, then replaces ``app.state.recognizer`` in a
+    single assignment.  Resident galleries of the previous model are dropped.
+
+    Images enrolled while the new cache was loading went to the old
+    recognizer only, so the new one is synced with the folder right before
+    the swap, and once more after it for writes that raced the assignment.
+    """
+    try:
+        db_path = app.state.db_path
+        current = app.state.galleries
+        galleries = GalleryManager(
+            model_name=model_name,
+            memory_budget_mb=current.memory_budget / 1024 / 1024,
+            match_mode=current.match_mode,
+            prototypes=current.prototypes,
+            recognizer_cls=current.recognizer_cls,
+            root=current.root,
+        )
+        recognizer = galleries.activate(db_path, preload=False)
+        recognizer.load_cache()
+        recognizer.warmup()
+        if app.state.db_path != db_path:
+            # The gallery folder changed while we were loading
+            recognizer = galleries.activate(app.state.db_path)
+        recognizer.sync_with_disk()
+    except Exception as e:
+        print(f"[settings] Model switch to {model_name} failed: {e}")
+        app.state.model_switch = {"model_name": model_name, "status": "error", "detail": str(e)}
+        return
+
+    app.state.galleries = galleries
+    app.state.recognizer = recognizer
+    try:
+        recognizer.sync_with_disk()
+    except Exception as e:
+        print(f"[settings] Post-switch sync of {recognizer.db_path} failed: {e}")
+    app.state.model_switch = {"model_name": model_name, "status": "done"}
+    print(f"[settings] Recognizer switched to {model_name}.")
 
 
 @router.get("")
 def get_settings(request: Request):
-    return {"db_path": request.app.state.db_path or ""}
+    state = request.app.state
+    return {
+        "db_path": state.db_path or "",
+        "model_name": state.recognizer.model_name,
+        "available_models": list(SUPPORTED_MODELS),
+        "model_switch": getattr(state, "model_switch", None),
+        "galleries": state.galleries.stats(),
+    }
 
 
 @router.post("")
 def update_settings(settings: Settings, request: Request):
-    new_path = settings.db_path
+    if settings.db_path is None and settings.model_name is None:
+        raise HTTPException(status_code=400, detail="No hay cambios que aplicar.")
+    if settings.model_name is not None and settings.model_name not in SUPPORTED_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Modelo no soportado. Opciones: {', '.join(SUPPORTED_MODELS)}",
+        )
+
+    response = {"message": "Settings updated", "db_path": request.app.state.db_path}
+    if settings.db_path is not None:
+        response["db_path"] = _update_db_path(settings.db_path, request)
+    if settings.model_name is not None:
+        response["model_switch"] = _update_model(settings.model_name, request)
+    return response
+
+
+def _update_model(model_name: str, request: Request) -> dict:
+    state = request.app.state
+    switch = getattr(state, "model_switch", None)
+    if switch and switch["status"] == "loading":
+        raise HTTPException(status_code=409, detail="Ya hay un cambio de modelo en curso.")
+    if model_name == state.recognizer.model_name:
+        return {"model_name": model_name, "status": "done"}
+
+    state.model_switch = {"model_name": model_name, "status": "loading"}
+    threading.Thread(
+        target=_swap_recognizer, args=(request.app, model_name), daemon=True
+    ).start()
+    return state.model_switch
+
 
+def _update_db_path(new_path: str, request: Request) -> str:
     if not new_path or not new_path.strip():
         raise HTTPException(status_code=400, detail="La ruta no puede estar vacía.")
 
@@ -33,11 +117,12 @@ def update_settings(settings: Settings, request: Request):
     if not os.path.isdir(new_path):
         raise HTTPException(status_code=400, detail="La ruta debe ser un directorio.")
 
-    request.app.state.db_path = new_path
-    request.app.state.recognizer.db_path = new_path
-    request.app.state.recognizer.load_cache()
+    # Instant if the gallery is still resident, otherwise loads (and may evict)
+    state = request.app.state
+    state.recognizer = state.galleries.activate(new_path)
+    state.db_path = new_path
 
-    return {"message": "Settings updated", "db_path": new_path}
+    return new_path
 
 
 @router.post("/browse")
@@ -0,0 +1,65 @@
+import os
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlmodel import Session
+from ..core.video_analysis import VideoAnalyzer
+from ..db import get_session, VideoRecording
+
+router = APIRouter(prefix="/api/video", tags=["video"])
+
+
+class AnalyzeRequest(BaseModel):
+    path: Optional[str] = None
+    recording_id: Optional[int] = None
+    sample_fps: float = 2.0
+    workers: Optional[int] = None
+    start_time: Optional[datetime] = None
+
+
+@router.post("/analyze", status_code=202)
+def analyze_video(
+    body: AnalyzeRequest, request: Request, session: Session = Depends(get_session)
+):
+    """
+    Queues recognition over a video file on the server, either one of our
+    recordings (``recording_id``) or any footage readable by OpenCV (``path``).
+    Results are stored as ``RecognitionLog`` rows linked to the recording.
+    """
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        raise HTTPException(status_code=503, detail="Models are still loading")
+    if body.sample_fps <= 0:
+        raise HTTPException(status_code=400, detail="sample_fps must be positive")
+
+    path = body.path
+    if body.recording_id is not None:
+        recording = session.get(VideoRecording, body.recording_id)
+        if not recording:
+            raise HTTPException(status_code=404, detail="Recording not found")
+        path = recording.file_path
+    if not path or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Video file not found on server")
+
+    analyzer = VideoAnalyzer(
+        state.detector,
+        state.recognizer,
+        state.quality_gate,
+        sample_fps=body.sample_fps,
+        workers=body.workers or state.video_workers,
+    )
+    return state.video_jobs.submit(path, analyzer, start_time=body.start_time)
+
+
+@router.get("/jobs")
+def video_jobs(request: Request):
+    return {"jobs": request.app.state.video_jobs.jobs()}
+
+
+@router.get("/jobs/{job_id}")
+def video_job(job_id: str, request: Request):
+    job = request.app.state.video_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
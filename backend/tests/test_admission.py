@@ -0,0 +1,72 @@
+from backend.core.admission import AdmissionController, retry_after_header
+from backend.routers.recognition import _reuse_key, _shed
+
+
+def test_admit_degrades_then_rejects_over_limit():
+    """Verifica que por encima del límite se degrada y, pasado el margen, se rechaza."""
+    ac = AdmissionController(initial_limit=2, degrade_slots=1)
+    assert [ac.admit() for _ in range(4)] == ["full", "full", "degraded", "reject"]
+    assert ac.in_flight == 3
+
+    ac.release(0.0, full=False)
+    assert ac.admit() == "degraded"
+    assert ac.stats()["admitted"] == 2
+
+
+def test_limit_adapts_to_latency():
+    """Verifica que el límite baja con latencias altas y sube al saturarse con latencias bajas."""
+    ac = AdmissionController(target_ms=100, initial_limit=4, max_limit=5)
+    for _ in range(4):
+        ac.admit()
+    ac.release(0.5)
+    assert ac.limit == 4 * ac.backoff
+    # Varias respuestas lentas seguidas cuentan como una sola señal
+    ac.release(0.5)
+    assert ac.limit == 4 * ac.backoff
+
+    ac.limit = 2.0
+    ac.in_flight = 0
+    for _ in range(2):
+        ac.admit()
+    ac.release(0.01)
+    assert ac.limit == 2.5
+    ac.release(0.01)  # ya no estaba saturado
+    assert ac.limit == 2.5
+
+
+def test_recent_results_expire_and_retry_hint():
+    """Verifica que el último resultado solo se reutiliza mientras es reciente."""
+    ac = AdmissionController(reuse_max_age=0.0)
+    ac.remember("cam1", [{"name": "alice"}])
+    assert ac.recent("cam2") is None
+    assert ac.recent("cam1") is None
+
+    ac.reuse_max_age = 60
+    assert ac.recent("cam1") == [{"name": "alice"}]
+
+    ac.observe({"total": 0.4})
+    assert ac.retry_after() == 0.4
+    assert retry_after_header(0.4) == "1"
+    ac.count("rejected")
+    assert ac.stats()["rejected"] == 1
+
+
+def test_stale_results_are_forgotten():
+    """Verifica que los resultados caducados de clientes antiguos no se acumulan."""
+    ac = AdmissionController(reuse_max_age=0.0)
+    for i in range(AdmissionController.MAX_REMEMBERED + 1):
+        ac.remember(f"tab{i}", [])
+    assert len(ac._last_results) <= 1
+
+
+def test_results_reused_only_for_explicit_camera():
+    """Verifica que sin camera explícita no se reutilizan resultados y que no se mezclan galerías."""
+    ac = AdmissionController()
+    assert _reuse_key(None, None) is None
+    assert _shed(ac, _reuse_key(None, None)) is None
+
+    ac.remember(_reuse_key("tab1", None), [{"name": "alice"}])
+    assert _shed(ac, _reuse_key("tab2", None)) is None
+    assert _shed(ac, _reuse_key("tab1", "/faces/b")) is None
+    assert _shed(ac, _reuse_key("tab1", None)) is not None
+    assert ac.stats()["reused"] == 1
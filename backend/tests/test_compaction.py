@@ -0,0 +1,58 @@
+import pickle
+
+import numpy as np
+
+from backend.core.compaction import dedupe, prototypes
+from backend.core.recognizer import FaceRecognizer
+from backend.tools.compact_gallery import apply, compact
+
+
+def _burst(rng, center, n, noise=0.01):
+    return center + noise * rng.standard_normal((n, center.shape[0]))
+
+
+def test_dedupe_and_prototypes():
+    """Verifica que se eliminan casi-duplicados y se limitan los prototipos."""
+    rng = np.random.default_rng(0)
+    a, b = rng.standard_normal(64), rng.standard_normal(64)
+    embs = np.concatenate([_burst(rng, a, 10), _burst(rng, b, 10)])
+    assert len(dedupe(embs, threshold=0.95)) == 2
+    protos = prototypes(embs, k=3)
+    assert protos.shape == (3, 64)
+    assert np.allclose(np.linalg.norm(protos, axis=1), 1.0)
+
+
+def test_compact_tool_prunes_cache_without_reembedding(tmp_path):
+    """Verifica que la herramienta reduce la galería y actualiza la caché."""
+    rng = np.random.default_rng(1)
+    rec = FaceRecognizer(db_path=str(tmp_path), preload=False)
+    entries = []
+    for name in ("alice", "bob"):
+        (tmp_path / name).mkdir()
+        center = rng.standard_normal(32)
+        for i, emb in enumerate(_burst(rng, center, 5)):
+            path = tmp_path / name / f"{i}.jpg"
+            path.write_bytes(b"")
+            entries.append({"name": name, "embedding": emb.astype(np.float32), "path": str(path)})
+    with open(rec._cache_file, "wb") as f:
+        pickle.dump({"model": "VGG-Face", "files": rec._scan_images(), "entries": entries}, f)
+
+    recognizer, dropped, report = compact(str(tmp_path), "VGG-Face", 0.95, 3)
+    assert report["rows"] == {"all": 10, "deduped": 2, "prototypes": 2}
+    assert report["match_rate"]["all"] == 1.0
+    # The kept image of each identity has no other row to match once excluded
+    assert report["match_rate"]["deduped"] == 0.8
+    # Leave-one-out: a kept image no longer matches the prototype built from itself
+    assert report["match_rate"]["prototypes"] == 0.8
+
+    assert apply(recognizer, dropped) == 8
+    reloaded = FaceRecognizer(db_path=str(tmp_path), match_mode="prototypes")
+    assert len(reloaded._cache) == 2
+    assert (tmp_path / ".pruned" / "alice").is_dir()
+    names, matrix = reloaded._matrix
+    assert sorted(names) == ["alice", "bob"] and matrix.shape == (2, 32)
+
+    # Writes re-cluster only the identities they touch, outside find_identity
+    bob = reloaded._protos["bob"]
+    reloaded.remove_images([c["path"] for c in reloaded._cache if c["name"] == "alice"])
+    assert reloaded._protos["bob"] is bob and reloaded._matrix[0] == ["bob"]
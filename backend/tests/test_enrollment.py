@@ -0,0 +1,87 @@
+import io
+import tarfile
+import time
+import zipfile
+
+import numpy as np
+
+from backend.core.enrollment import BulkEnrollment
+from backend.core.recognizer import FaceRecognizer
+
+
+def _recognizer(tmp_path, monkeypatch):
+    rec = FaceRecognizer(db_path=str(tmp_path / "faces"), preload=False)
+    monkeypatch.setattr(rec, "_represent", lambda path: np.ones(8, np.float32))
+    return rec
+
+
+def _wait(enrollment, job_id):
+    for _ in range(200):
+        job = enrollment.get(job_id)
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_zip_archive_is_enrolled_with_error_report(tmp_path, monkeypatch):
+    """Verifica que un zip se extrae, se embebe y reporta errores por entrada del archivo."""
+    archive = tmp_path / "batch.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("alice/1.jpg", b"x")
+        zf.writestr("alice/2.jpg", b"x")
+        zf.writestr("bob/1.png", b"x")
+        zf.writestr("bob/notes.txt", b"x")
+        zf.writestr("orphan.jpg", b"x")
+        zf.writestr("export/carol/noface.jpg", b"x")
+
+    rec = _recognizer(tmp_path, monkeypatch)
+    monkeypatch.setattr(
+        rec, "_represent",
+        lambda path: None if path.endswith("noface.jpg") else np.ones(8, np.float32),
+    )
+    enrollment = BulkEnrollment(max_workers=2)
+    job = _wait(enrollment, enrollment.submit(str(archive), rec)["id"])
+
+    assert job["status"] == "done"
+    assert (job["files_total"], job["embedded"], job["failed"], job["identities"]) == (6, 3, 3, 3)
+    # Los fallos de embedding usan el nombre dentro del archivo, no la ruta en el servidor
+    assert {e["file"] for e in job["errors"]} == {"bob/notes.txt", "orphan.jpg", "export/carol/noface.jpg"}
+    assert sorted(c["name"] for c in rec._cache) == ["alice", "alice", "bob"]
+    assert not archive.exists()
+    assert rec._files == rec._scan_images()
+
+
+def test_tar_archive_is_streamed(tmp_path, monkeypatch):
+    """Verifica que también se aceptan archivos tar."""
+    archive = tmp_path / "batch.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        info = tarfile.TarInfo("carol/a.jpg")
+        info.size = 1
+        tf.addfile(info, io.BytesIO(b"x"))
+
+    rec = _recognizer(tmp_path, monkeypatch)
+    enrollment = BulkEnrollment()
+    job = _wait(enrollment, enrollment.submit(str(archive), rec)["id"])
+    assert job["status"] == "done" and job["embedded"] == 1
+
+
+def test_colliding_names_never_overwrite(tmp_path, monkeypatch):
+    """Verifica que varios archivos con el mismo nombre se guardan todos, sin duplicar la caché."""
+    archive = tmp_path / "batch.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for folder in ("x", "y", "z"):
+            zf.writestr(f"{folder}/alice/1.jpg", folder.encode())
+
+    rec = _recognizer(tmp_path, monkeypatch)
+    saves = []
+    monkeypatch.setattr(rec, "_save_cache", lambda: saves.append(len(rec._cache)))
+    enrollment = BulkEnrollment()
+    job = _wait(enrollment, enrollment.submit(str(archive), rec)["id"])
+
+    files = sorted(p.read_bytes() for p in (tmp_path / "faces" / "alice").iterdir())
+    assert files == [b"x", b"y", b"z"]
+    assert job["embedded"] == 3
+    assert len({c["path"] for c in rec._cache}) == len(rec._cache) == 3
+    # La caché en disco se escribe una sola vez, al terminar el trabajo
+    assert saves == [3]
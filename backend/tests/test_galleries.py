@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from backend.core.galleries import GalleryManager
+
+
+def _fill(recognizer, n, dim=1024):
+    recognizer._cache = [
+        {"name": f"p{i}", "embedding": np.zeros(dim, np.float32), "path": ""} for i in range(n)
+    ]
+
+
+def test_resident_gallery_is_reused(tmp_path):
+    """Verifica que volver a una galería residente no crea otro reconocedor."""
+    manager = GalleryManager()
+    a = manager.activate(str(tmp_path / "a"), preload=False)
+    manager.get(str(tmp_path / "b"), preload=False)
+    assert manager.activate(str(tmp_path / "a"), preload=False) is a
+    assert manager.is_resident(str(tmp_path / "b"))
+
+
+def test_lru_eviction_respects_budget_and_active(tmp_path):
+    """Verifica que se expulsa la galería menos usada, nunca la activa."""
+    manager = GalleryManager(memory_budget_mb=1)  # 256 embeddings of 4 KB
+    _fill(manager.activate(str(tmp_path / "active"), preload=False), 100)
+    _fill(manager.get(str(tmp_path / "old"), preload=False), 100)
+    _fill(manager.get(str(tmp_path / "new"), preload=False), 100)
+    manager.get(str(tmp_path / "another"), preload=False)
+
+    assert not manager.is_resident(str(tmp_path / "old"))
+    assert manager.is_resident(str(tmp_path / "active"))
+    assert manager.stats()["memory_used_mb"] <= 1
+
+
+def test_cold_gallery_loads_in_background(tmp_path):
+    """Verifica que solo se aceptan galerías bajo la raíz y que las frías se cargan en segundo plano."""
+    manager = GalleryManager(root=str(tmp_path / "db"))
+    cold = tmp_path / "db" / "other"
+    cold.mkdir(parents=True)
+
+    assert manager.is_allowed(str(cold))
+    assert not manager.is_allowed(str(tmp_path / "elsewhere"))
+    assert not manager.is_allowed(str(tmp_path / "db" / ".." / "elsewhere"))
+    assert manager.get_resident(str(cold)) is None
+
+    if not manager.load_in_background(str(cold)):
+        for _ in range(100):
+            if manager.get_resident(str(cold)) is not None:
+                break
+            time.sleep(0.05)
+    assert manager.get_resident(str(cold)) is not None
+    assert manager.stats()["loading"] == []
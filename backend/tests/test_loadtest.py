@@ -0,0 +1,48 @@
+import numpy as np
+
+from backend.core.stubs import StubFaceDetector, StubFaceRecognizer
+from backend.tools.loadtest import Stats, parse_server_timing
+
+
+def test_parse_server_timing():
+    """Verifica que se extraen las duraciones por etapa de la cabecera Server-Timing."""
+    header = "decode;dur=1.5, detect;dur=12, recognize;desc=\"x\";dur=3.25"
+    assert parse_server_timing(header) == {"decode": 1.5, "detect": 12.0, "recognize": 3.25}
+    assert parse_server_timing(None) == {}
+
+
+def test_degraded_results_are_kept_apart():
+    """Verifica que las respuestas degradadas no se mezclan con las completas en latencia ni etapas."""
+    stats = Stats()
+    stats.record(200, 300.0, "total;dur=290")
+    stats.record(200, 5.0, None, "reused")
+    stats.record(200, 80.0, "detect;dur=70", "detection_only")
+    stats.record(503, 2.0)
+    assert stats.latencies == [300.0]
+    assert stats.degraded_latencies == [5.0, 80.0]
+    assert dict(stats.stages) == {"total": [290.0]}
+    assert stats.degraded == {"reused": 1, "detection_only": 1}
+
+
+def test_stub_models_match_enrolled_face(tmp_path, monkeypatch):
+    """Verifica que los modelos simulados recorren el camino real de enrolamiento y búsqueda."""
+    monkeypatch.setattr(StubFaceRecognizer, "latency_ms", 0)
+    person = tmp_path / "alice"
+    person.mkdir()
+    (person / "a.jpg").write_bytes(b"")
+
+    rec = StubFaceRecognizer(db_path=str(tmp_path), model_name="SFace")
+    assert rec.embedding_size == 128
+
+    frame = np.random.default_rng(1).integers(0, 255, (240, 320, 3), dtype=np.uint8)
+    faces = StubFaceDetector(latency_ms=0).detect_faces(frame)
+    assert len(faces) == 1
+    x, y, w, h = faces[0]["box"]
+    crop = frame[y : y + h, x : x + w]
+
+    # Un embedding aleatorio no coincide con nadie; el mismo recorte siempre da el mismo vector
+    assert rec.find_identity(crop)[0] == "Unknown"
+    with rec._write_lock:
+        rec._publish([{**rec._cache[0], "embedding": rec._represent_crop(crop)}])
+    assert rec.find_identity(crop)[0] == "alice"
+    assert not list(tmp_path.glob("*.pkl"))
@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 from fastapi.testclient import TestClient
 from backend.main import app
 
@@ -12,3 +15,19 @@ def test_read_root():
 def test_app_instance():
     """Verifica que la instancia de la app existe."""
     assert app is not None
+
+def test_health_and_ready():
+    """Verifica liveness y que /ready responde 503 mientras no hay modelos."""
+    assert client.get("/health").status_code == 200
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "loading"
+
+def test_import_is_lightweight():
+    """Verifica que importar la app no carga TensorFlow ni DeepFace."""
+    code = "import sys, backend.main; print('tensorflow' in sys.modules or 'deepface' in sys.modules)"
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip().endswith("False")
@@ -0,0 +1,34 @@
+import pytest
+
+from backend.core.profiler import PipelineProfiler
+
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+def test_idle_profiler_is_passthrough():
+    """Verifica que sin sesión activa la llamada no se perfila."""
+    profiler = PipelineProfiler()
+    assert profiler.call("detect", _work, 10) == _work(10)
+    profiler.request_done()
+    assert profiler.status() == {"active": False, "last_report": None}
+
+
+def test_session_stops_after_max_requests(tmp_path):
+    """Verifica que la sesión se cierra sola tras N peticiones y genera el informe."""
+    profiler = PipelineProfiler(output_dir=str(tmp_path))
+    profiler.start(max_requests=2, trace_memory=True)
+    with pytest.raises(RuntimeError):
+        profiler.start(max_requests=1)
+
+    for _ in range(2):
+        profiler.call("recognize", _work, 1000)
+        profiler.request_done()
+
+    assert not profiler.is_active
+    report = profiler.last_report
+    assert report["requests"] == 2
+    assert report["stages"]["recognize"]["calls"] == 2
+    assert "_work" in report["top_functions"]
+    assert report["profile_file"].startswith(str(tmp_path))
@@ -0,0 +1,28 @@
+import numpy as np
+
+from backend.core.quality import FaceQualityGate
+
+FRONTAL = {"left_eye": (30, 40), "right_eye": (70, 40), "nose": (50, 60)}
+
+
+def _textured(size):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (size, size, 3), dtype=np.uint8)
+
+
+def test_sharp_frontal_face_passes():
+    """Verifica que un rostro nítido, frontal y grande pasa el filtro."""
+    gate = FaceQualityGate()
+    result = gate.assess(_textured(100), FRONTAL)
+    assert result["ok"], result
+    assert abs(result["yaw"]) < 0.01 and abs(result["roll"]) < 0.01
+
+
+def test_low_quality_faces_are_rejected():
+    """Verifica que se rechazan rostros pequeños, borrosos o de perfil."""
+    gate = FaceQualityGate()
+    assert "too_small" in gate.assess(_textured(20), FRONTAL)["reasons"]
+    assert "blurry" in gate.assess(np.full((100, 100, 3), 128, np.uint8), FRONTAL)["reasons"]
+    profile = {**FRONTAL, "nose": (75, 60)}
+    assert "yaw" in gate.assess(_textured(100), profile)["reasons"]
+    assert gate.stats()["rejected"] == 3
@@ -0,0 +1,94 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from backend.core.recognizer import FaceRecognizer
+
+
+def test_cache_file_is_per_model(tmp_path):
+    """Verifica que cada modelo usa su propio archivo de caché."""
+    vgg = FaceRecognizer(db_path=str(tmp_path), preload=False)
+    sface = FaceRecognizer(db_path=str(tmp_path), model_name="SFace", preload=False)
+    assert vgg._cache_file != sface._cache_file
+    assert sface.threshold != vgg.threshold
+    with pytest.raises(ValueError):
+        FaceRecognizer(model_name="NotAModel")
+
+
+def test_load_cache_uses_matching_payload(tmp_path):
+    """Verifica que se reutiliza la caché si el modelo y las imágenes coinciden."""
+    person = tmp_path / "alice"
+    person.mkdir()
+    (person / "a.jpg").write_bytes(b"")
+    rec = FaceRecognizer(db_path=str(tmp_path), model_name="SFace", preload=False)
+    entries = [{"name": "alice", "embedding": np.ones(128, np.float32), "path": str(person / "a.jpg")}]
+    payload = {"model": "SFace", "files": rec._scan_images(), "entries": entries}
+    with open(rec._cache_file, "wb") as f:
+        pickle.dump(payload, f)
+
+    rec.load_cache()
+    assert rec.embedding_size == 128
+    assert os.path.basename(rec._cache_file) == "embeddings_cache_sface.pkl"
+
+
+def test_add_during_load_is_not_lost(tmp_path, monkeypatch):
+    """Verifica que una imagen añadida mientras se carga la caché no queda sobrescrita."""
+    import threading
+
+    person = tmp_path / "alice"
+    person.mkdir()
+    (person / "a.jpg").write_bytes(b"")
+    rec = FaceRecognizer(db_path=str(tmp_path), model_name="SFace", preload=False)
+    monkeypatch.setattr(rec, "_represent", lambda path: np.ones(128, np.float32))
+    rec.reload_db()
+
+    # La carga se detiene justo después de validar la caché contra el disco
+    loading, release = threading.Event(), threading.Event()
+    real_scan = rec._scan_images
+
+    def slow_scan():
+        files = real_scan()
+        loading.set()
+        release.wait(1)
+        return files
+
+    monkeypatch.setattr(rec, "_scan_images", slow_scan)
+    loader = threading.Thread(target=rec.load_cache)
+    loader.start()
+    loading.wait(5)
+
+    (person / "b.jpg").write_bytes(b"")
+    adder = threading.Thread(target=rec.add_images, args=([str(person / "b.jpg")],))
+    adder.start()
+    adder.join(0.3)  # sin el candado terminaría aquí, antes de que la carga asigne
+    release.set()
+    loader.join(5)
+    adder.join(5)
+
+    assert sorted(os.path.basename(c["path"]) for c in rec._cache) == ["a.jpg", "b.jpg"]
+
+
+def test_sync_with_disk_picks_up_missed_writes(tmp_path, monkeypatch):
+    """Verifica que un reconocedor cargado antes de altas y bajas se pone al día con la carpeta."""
+    for name in ("alice", "bob"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "a.jpg").write_bytes(b"")
+    rec = FaceRecognizer(db_path=str(tmp_path), model_name="SFace", preload=False)
+    embedded = []
+    monkeypatch.setattr(
+        rec, "_represent", lambda path: embedded.append(path) or np.ones(128, np.float32)
+    )
+    rec.reload_db()
+    embedded.clear()
+
+    # Escrituras que fueron a otro reconocedor mientras este cargaba
+    (tmp_path / "carol").mkdir()
+    (tmp_path / "carol" / "a.jpg").write_bytes(b"")
+    os.remove(tmp_path / "bob" / "a.jpg")
+
+    assert rec.sync_with_disk() == (1, 1)
+    assert sorted(c["name"] for c in rec._cache) == ["alice", "carol"]
+    assert embedded == [str(tmp_path / "carol" / "a.jpg")]
+    assert rec.sync_with_disk() == (0, 0)
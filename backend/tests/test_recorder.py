@@ -0,0 +1,52 @@
+import os
+
+import cv2
+import numpy as np
+
+from backend.core.recorder import RecordingSessions, VideoRecorder
+
+
+def test_sessions_are_independent_per_camera(tmp_path):
+    """Verifica que cada cámara graba su propio archivo con su propio tamaño de cuadro."""
+    sessions = RecordingSessions(output_dir=str(tmp_path))
+    lobby = sessions.start("lobby")
+    gate = sessions.start("gate/1")
+    assert sessions.start("lobby") is lobby
+    assert lobby.current_file != gate.current_file
+    assert os.path.basename(gate.current_file).startswith("rec_gate_1_")
+
+    for _ in range(5):
+        lobby.add_frame(np.zeros((240, 320, 3), np.uint8))
+        gate.add_frame(np.zeros((120, 160, 3), np.uint8))
+    assert {s["camera"] for s in sessions.stats()} == {"lobby", "gate/1"}
+
+    stopped = dict((rec.camera_id, (rec, result)) for rec, result in sessions.stop_all())
+    assert sessions.get("lobby") is None and sessions.stats() == []
+    for camera, size in (("lobby", (320, 240)), ("gate/1", (160, 120))):
+        rec, (file_path, start_time, end_time) = stopped[camera]
+        cap = cv2.VideoCapture(file_path)
+        assert (cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) == size
+        cap.release()
+        assert rec.frames_written == 5
+        assert end_time >= start_time
+
+    assert sessions.stop("lobby") == (None, (None, None, None))
+
+
+def test_ids_that_clean_alike_get_separate_files(tmp_path):
+    """Verifica que cámaras cuyos ids se limpian igual, iniciadas en el mismo segundo, no comparten archivo."""
+    sessions = RecordingSessions(output_dir=str(tmp_path))
+    recorders = [sessions.start(camera) for camera in ("gate/1", "gate:1", "gate_1")]
+    files = {rec.current_file for rec in recorders}
+    assert len(files) == 3
+    assert all(os.path.basename(f).startswith("rec_gate_1_") for f in files)
+
+    # Una cámara reiniciada dentro del mismo segundo tampoco reutiliza el archivo
+    again = VideoRecorder(str(tmp_path), camera_id="gate/1")
+    again.start()
+    assert again.current_file not in files
+
+    # Sin cuadros no queda un archivo vacío reservado
+    for rec in recorders + [again]:
+        rec.stop()
+    assert not list(tmp_path.iterdir())
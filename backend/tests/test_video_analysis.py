@@ -0,0 +1,92 @@
+import sys
+import threading
+import time
+import types
+
+import cv2
+import numpy as np
+
+from backend.core import detector as detector_module
+from backend.core.video_analysis import VideoAnalysisJobs, VideoAnalyzer
+
+
+class _OneFaceDetector:
+    def detect_faces(self, frame):
+        return [{"box": [10, 10, 50, 50], "confidence": 0.99, "keypoints": {}}]
+
+
+class _FixedRecognizer:
+    def find_identity(self, crop):
+        return "alice", 0.1
+
+
+def _write_video(path, frames=50, fps=25.0):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (160, 120))
+    for i in range(frames):
+        writer.write(np.full((120, 160, 3), i % 255, np.uint8))
+    writer.release()
+
+
+def test_video_is_sampled_at_requested_rate(tmp_path):
+    """Verifica que se muestrean frames a la tasa pedida y se reconocen en paralelo."""
+    video = tmp_path / "clip.avi"
+    _write_video(video)
+
+    progress = []
+    analyzer = VideoAnalyzer(_OneFaceDetector(), _FixedRecognizer(), sample_fps=5.0, workers=2)
+    summary = analyzer.run(str(video), on_progress=lambda *a: progress.append(a))
+
+    assert summary["frames_total"] == 50
+    assert summary["frames_sampled"] == 10
+    assert summary["duration_s"] == 2.0
+    assert summary["detections"][0] == (0.0, "alice", 0.9)
+    assert [d[0] for d in summary["detections"]] == sorted(d[0] for d in summary["detections"])
+    assert progress[-1] == (50, 50, 10)
+
+
+def test_shutdown_cancels_running_job(tmp_path):
+    """Verifica que shutdown() detiene el análisis en curso entre frames sin guardar resultados."""
+    started = threading.Event()
+
+    class _SlowRecognizer(_FixedRecognizer):
+        def find_identity(self, crop):
+            started.set()
+            time.sleep(0.05)
+            return super().find_identity(crop)
+
+    video = tmp_path / "clip.avi"
+    _write_video(video, frames=500)
+    jobs = VideoAnalysisJobs()
+    analyzer = VideoAnalyzer(_OneFaceDetector(), _SlowRecognizer(), sample_fps=25.0, workers=1)
+    running = jobs.submit(str(video), analyzer, start_time=None)
+    queued = jobs.submit(str(video), analyzer, start_time=None)
+    assert started.wait(5)
+
+    t0 = time.perf_counter()
+    jobs.shutdown(timeout=5)
+    assert time.perf_counter() - t0 < 2
+    assert not jobs._runner.is_alive()
+    assert jobs.get(running["id"])["status"] == "cancelled"
+    assert jobs.get(queued["id"])["status"] == "cancelled"
+    assert jobs.get(running["id"])["recording_id"] is None
+
+
+def test_detector_is_built_once_under_concurrent_first_use(monkeypatch):
+    """Verifica que varios hilos que piden el detector a la vez construyen MTCNN una sola vez."""
+    built = []
+
+    class _SlowMTCNN:
+        def __init__(self):
+            built.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setitem(sys.modules, "mtcnn", types.SimpleNamespace(MTCNN=_SlowMTCNN))
+    monkeypatch.setattr(detector_module, "_configure_gpu", lambda: "CPU")
+    detector = detector_module.FaceDetector()
+
+    threads = [threading.Thread(target=detector._get_detector) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 1
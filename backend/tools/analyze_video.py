@@ -0,0 +1,68 @@
+"""
+Run face recognition over a video file and store the results as
+RecognitionLog rows linked to a VideoRecording.
+
+Run from the project root:
+    python -m backend.tools.analyze_video recordings/rec_20250101_120000.mp4 --fps 2
+    python -m backend.tools.analyze_video export.avi --start-time 2025-01-01T08:00:00 --workers 16
+
+Uses the same settings as the API (``DB_PATH``, ``EMBEDDING_MODEL``,
+``QUALITY_*``) and writes to the same SQLite database.
+"""
+import argparse
+import os
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from backend.core.detector import FaceDetector
+from backend.core.quality import FaceQualityGate
+from backend.core.recognizer import FaceRecognizer
+from backend.core.video_analysis import VideoAnalyzer, save_results
+from backend.db import create_db_and_tables
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("video", help="Video file readable by OpenCV")
+    parser.add_argument("--fps", type=float, default=2.0, help="Frames analysed per second of footage")
+    parser.add_argument("--workers", type=int, default=None, help="Analysis threads (default: CPU count)")
+    parser.add_argument("--start-time", type=datetime.fromisoformat, default=None,
+                        help="Wall-clock start of the footage (UTC, ISO 8601)")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", os.path.join("db", "faces")),
+                        help="Face database folder")
+    parser.add_argument("--dry-run", action="store_true", help="Do not write to the database")
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    detector = FaceDetector()
+    recognizer = FaceRecognizer(db_path=args.db, model_name=os.getenv("EMBEDDING_MODEL", "VGG-Face"))
+    # Build both models once, as the API does before /ready, instead of from every worker at once
+    detector.warmup()
+    recognizer.warmup()
+    analyzer = VideoAnalyzer(
+        detector,
+        recognizer,
+        FaceQualityGate.from_env(),
+        sample_fps=args.fps,
+        workers=args.workers,
+    )
+
+    def _progress(read, total, sampled):
+        pct = f"{read / total:.0%}" if total else "?"
+        print(f"\r[video] {read}/{total or '?'} frames ({pct}), {sampled} analysed", end="", flush=True)
+
+    summary = analyzer.run(args.video, on_progress=_progress)
+    print()
+    print(f"[video] {summary['frames_sampled']} frames in {summary['elapsed_s']}s: "
+          f"{summary['fps']} frames/s, {summary['realtime_factor']}x realtime, "
+          f"{len(summary['detections'])} detections ({analyzer.workers} workers)")
+
+    if not args.dry_run:
+        recording_id = save_results(args.video, summary, args.start_time)
+        print(f"[video] Results stored under VideoRecording #{recording_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-face embedding latency and size for the DeepFace models supported by
+``FaceRecognizer``.
+
+Run from the project root:
+    python -m backend.tools.benchmark_models --images db/faces --models VGG-Face SFace Facenet
+
+Face crops are read from ``--images`` (searched recursively); without it, random
+crops are used, which is enough to compare latency but not accuracy.
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from backend.core.recognizer import FaceRecognizer, SUPPORTED_MODELS
+
+
+def _load_crops(images_dir: str | None, limit: int) -> list[np.ndarray]:
+    crops: list[np.ndarray] = []
+    if images_dir:
+        for root, _, files in os.walk(images_dir):
+            for file in sorted(files):
+                if not FaceRecognizer._is_image(file):
+                    continue
+                img = cv2.imread(os.path.join(root, file))
+                if img is not None:
+                    crops.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+                if len(crops) >= limit:
+                    return crops
+    if not crops:
+        rng = np.random.default_rng(0)
+        crops = [rng.integers(0, 255, (160, 160, 3), dtype=np.uint8) for _ in range(limit)]
+    return crops
+
+
+def benchmark_model(model_name: str, crops: list[np.ndarray]) -> dict:
+    from deepface import DeepFace
+
+    t0 = time.perf_counter()
+    FaceRecognizer(model_name=model_name).warmup()
+    load_s = time.perf_counter() - t0
+
+    latencies: list[float] = []
+    dim = 0
+    for crop in crops:
+        t0 = time.perf_counter()
+        reps = DeepFace.represent(
+            img_path=crop,
+            model_name=model_name,
+            detector_backend="skip",
+            enforce_detection=False,
+        )
+        latencies.append((time.perf_counter() - t0) * 1000)
+        dim = len(reps[0]["embedding"])
+
+    lat = np.array(latencies)
+    return {
+        "model": model_name,
+        "load_s": load_s,
+        "dim": dim,
+        "bytes": dim * 4,  # cached as float32
+        "mean_ms": float(lat.mean()),
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p95_ms": float(np.percentile(lat, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", help="Folder with face crops (e.g. db/faces)")
+    parser.add_argument("--models", nargs="+", default=["VGG-Face", "Facenet", "SFace"],
+                        choices=list(SUPPORTED_MODELS))
+    parser.add_argument("--count", type=int, default=50, help="Crops per model")
+    args = parser.parse_args()
+
+    crops = _load_crops(args.images, args.count)
+    print(f"Benchmarking {len(crops)} crops per model\n")
+    print(f"{'model':<14}{'load s':>9}{'dim':>7}{'bytes':>8}{'mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for model_name in args.models:
+        try:
+            r = benchmark_model(model_name, crops)
+        except Exception as e:
+            print(f"{model_name:<14} failed: {e}")
+            continue
+        print(f"{r['model']:<14}{r['load_s']:>9.1f}{r['dim']:>7}{r['bytes']:>8}"
+              f"{r['mean_ms']:>10.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compact a face gallery: prune near-duplicate enrollment images and report
+how much the gallery shrinks with per-identity prototypes.
+
+Run from the project root:
+    python -m backend.tools.compact_gallery --db db/faces --threshold 0.95 --prototypes 3
+    python -m backend.tools.compact_gallery --db db/faces --apply
+
+Without ``--apply`` nothing is changed.  With it, pruned images are moved to
+``<db>/.pruned/<identity>/`` (restore by moving them back) and removed from
+the embeddings cache, so nobody is re-embedded.  Prototype matching is
+enabled at runtime with ``MATCH_MODE=prototypes``.
+
+Match rate is the share of enrolled images whose nearest gallery entry is
+their own identity within the model threshold, each image excluded from the
+gallery it is matched against.  For prototypes that means the query's
+identity is re-clustered without it.
+"""
+import argparse
+import os
+import shutil
+
+import numpy as np
+
+from backend.core.compaction import (
+    build_prototypes, match_rate, normalize, plan, prototype_match_rate,
+)
+from backend.core.recognizer import FaceRecognizer, SUPPORTED_MODELS
+
+
+def _mb(rows: int, dim: int) -> float:
+    return rows * dim * 4 / 1024 / 1024
+
+
+def compact(db_path: str, model_name: str, threshold: float, k: int) -> tuple[FaceRecognizer, list[dict], dict]:
+    recognizer = FaceRecognizer(db_path=db_path, model_name=model_name)
+    entries = recognizer._cache
+    if not entries:
+        return recognizer, [], {}
+
+    kept, dropped = plan(entries, threshold)
+    dim = recognizer.embedding_size
+    rate_threshold = recognizer.threshold
+
+    def _rate(gallery: list[dict]) -> float:
+        matrix = normalize(np.stack([e["embedding"] for e in gallery]))
+        return match_rate(
+            entries, [e["name"] for e in gallery], matrix, rate_threshold,
+            paths=[e["path"] for e in gallery],
+        )
+
+    proto_names, _ = build_prototypes(kept, k)
+    report = {
+        "identities": len({e["name"] for e in entries}),
+        "rows": {"all": len(entries), "deduped": len(kept), "prototypes": len(proto_names)},
+        "memory_mb": {
+            "all": _mb(len(entries), dim),
+            "deduped": _mb(len(kept), dim),
+            "prototypes": _mb(len(proto_names), dim),
+        },
+        "match_rate": {
+            "all": _rate(entries),
+            "deduped": _rate(kept),
+            "prototypes": prototype_match_rate(entries, kept, k, rate_threshold),
+        },
+    }
+    return recognizer, dropped, report
+
+
+def apply(recognizer: FaceRecognizer, dropped: list[dict]) -> int:
+    """Moves pruned images under ``.pruned/`` and drops them from the cache."""
+    moved: list[str] = []
+    for entry in dropped:
+        dest_dir = os.path.join(recognizer.db_path, ".pruned", entry["name"])
+        os.makedirs(dest_dir, exist_ok=True)
+        try:
+            shutil.move(entry["path"], os.path.join(dest_dir, os.path.basename(entry["path"])))
+            moved.append(entry["path"])
+        except OSError as e:
+            print(f"[compact] could not move {entry['path']}: {e}")
+    recognizer.remove_images(moved)
+    return len(moved)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", required=True, help="Face database folder")
+    parser.add_argument("--model", default="VGG-Face", choices=list(SUPPORTED_MODELS))
+    parser.add_argument("--threshold", type=float, default=0.95,
+                        help="Cosine similarity at or above which images are near-duplicates")
+    parser.add_argument("--prototypes", type=int, default=3, help="Prototypes per identity")
+    parser.add_argument("--apply", action="store_true", help="Move near-duplicates out of the gallery")
+    args = parser.parse_args()
+
+    recognizer, dropped, report = compact(args.db, args.model, args.threshold, args.prototypes)
+    if not report:
+        print("Gallery is empty.")
+        return
+
+    print(f"\n{report['identities']} identities, model {args.model}\n")
+    print(f"{'gallery':<12}{'rows':>8}{'MB':>10}{'match rate':>13}")
+    for key in ("all", "deduped", "prototypes"):
+        print(f"{key:<12}{report['rows'][key]:>8}{report['memory_mb'][key]:>10.2f}"
+              f"{report['match_rate'][key]:>12.1%}")
+
+    if args.apply:
+        print(f"\nMoved {apply(recognizer, dropped)} near-duplicate images to "
+              f"{os.path.join(args.db, '.pruned')}")
+    else:
+        print(f"\n{len(dropped)} near-duplicates found. Re-run with --apply to prune them.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Simulate many cameras posting frames to /api/recognize, the way the
+Recognition page capture loop does.
+
+Start a server (stub models need no GPU or model weights):
+    STUB_MODELS=true uvicorn backend.main:app --port 8000
+
+Then run from the project root:
+    python -m backend.tools.loadtest --frames samples/ --cameras 8 --fps 5 --duration 60
+    python -m backend.tools.loadtest --frames samples/ --cameras 4 --fps 10 --record
+
+Each camera produces frames at ``--fps`` under its own ``camera`` id (and,
+with ``--record``, its own recording session) and, like the browser loop,
+keeps at most one request in flight.  Frames that are due while the previous
+request is still pending are dropped.  The report covers client-side latency
+percentiles, throughput, error and drop rates, and the server's per-stage
+``Server-Timing`` durations.  Throughput and latency are reported separately
+for full results and for degraded ones (``reused`` / ``detection_only``),
+which are cheap by design and would otherwise flatter the numbers.
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter, defaultdict
+
+import cv2
+import httpx
+import numpy as np
+
+
+def load_frames(folder: str | None, width: int = 1280, height: int = 720) -> list[bytes]:
+    """JPEG bytes from *folder*, or a few synthetic frames when none is given."""
+    frames: list[bytes] = []
+    if folder:
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith((".jpg", ".jpeg")):
+                with open(os.path.join(folder, name), "rb") as f:
+                    frames.append(f.read())
+    if not frames:
+        rng = np.random.default_rng(0)
+        for _ in range(8):
+            img = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+            frames.append(cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 75])[1].tobytes())
+    return frames
+
+
+def parse_server_timing(header: str | None) -> dict[str, float]:
+    """``"detect;dur=12.3, total;dur=20"`` -> ``{"detect": 12.3, "total": 20.0}``"""
+    timings: dict[str, float] = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                timings[name] = float(value)
+    return timings
+
+
+class Stats:
+    def __init__(self):
+        self.produced = 0
+        self.dropped = 0
+        self.latencies: list[float] = []
+        self.degraded_latencies: list[float] = []
+        self.statuses: Counter = Counter()
+        self.degraded: Counter = Counter()
+        self.stages: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, status, latency_ms: float, timing_header: str | None = None, degraded=None):
+        """Latencies and stage times of degraded 200s are kept apart from full results."""
+        self.statuses[status] += 1
+        if status != 200:
+            return
+        if degraded:
+            self.degraded[degraded] += 1
+            self.degraded_latencies.append(latency_ms)
+            return
+        self.latencies.append(latency_ms)
+        for stage, ms in parse_server_timing(timing_header).items():
+            self.stages[stage].append(ms)
+
+
+async def camera(
+    client: httpx.AsyncClient,
+    camera_id: int,
+    frames: list[bytes],
+    fps: float,
+    deadline: float,
+    stats: Stats,
+    gallery: str | None,
+):
+    interval = 1.0 / fps
+    in_flight: asyncio.Task | None = None
+    # Stagger cameras so they do not all fire on the same tick
+    next_due = time.perf_counter() + interval * (camera_id % 10) / 10
+    i = camera_id
+
+    params = {"camera": f"cam{camera_id}"}
+    if gallery:
+        params["gallery"] = gallery
+
+    async def _send(jpeg: bytes):
+        t0 = time.perf_counter()
+        try:
+            r = await client.post(
+                "/api/recognize",
+                files={"file": ("frame.jpg", jpeg, "image/jpeg")},
+                params=params,
+            )
+            latency_ms = (time.perf_counter() - t0) * 1000
+            degraded = r.json().get("degraded") if r.status_code == 200 else None
+            stats.record(r.status_code, latency_ms, r.headers.get("server-timing"), degraded)
+        except httpx.HTTPError as e:
+            stats.record(type(e).__name__, (time.perf_counter() - t0) * 1000)
+
+    while next_due < deadline:
+        await asyncio.sleep(max(0.0, next_due - time.perf_counter()))
+        next_due += interval
+        stats.produced += 1
+        if in_flight is not None and not in_flight.done():
+            stats.dropped += 1
+            continue
+        in_flight = asyncio.create_task(_send(frames[i % len(frames)]))
+        i += 1
+
+    if in_flight is not None:
+        await in_flight
+
+
+async def run(args) -> tuple[Stats, float]:
+    frames = load_frames(args.frames)
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.cameras + 4)
+    cameras = [{"camera": f"cam{c}"} for c in range(args.cameras)]
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        if args.record:
+            for params in cameras:
+                await client.post("/api/recognize/start_recording", params=params)
+        t0 = time.perf_counter()
+        deadline = t0 + args.duration
+        await asyncio.gather(*(
+            camera(client, c, frames, args.fps, deadline, stats, args.gallery)
+            for c in range(args.cameras)
+        ))
+        elapsed = time.perf_counter() - t0
+        if args.record:
+            await asyncio.gather(*(
+                client.post("/api/recognize/stop_recording", params=params, timeout=120)
+                for params in cameras
+            ))
+    return stats, elapsed
+
+
+def _pct(values: list[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+def _latency_line(label: str, lat: list[float]) -> str:
+    return (f"latency ms {label:<9} p50 {_pct(lat, 50):.1f}  p95 {_pct(lat, 95):.1f}  "
+            f"p99 {_pct(lat, 99):.1f}  max {max(lat, default=float('nan')):.1f}")
+
+
+def report(stats: Stats, elapsed: float, args):
+    sent = sum(stats.statuses.values())
+    ok = stats.statuses.get(200, 0)
+    full, degraded = len(stats.latencies), len(stats.degraded_latencies)
+    print(f"\n{args.cameras} cameras x {args.fps} fps for {elapsed:.1f}s against {args.url}")
+    print(f"frames produced {stats.produced}, sent {sent}, dropped {stats.dropped} "
+          f"({stats.dropped / max(stats.produced, 1):.1%})")
+    print(f"throughput full {full / elapsed:.1f} frames/s, degraded {degraded / elapsed:.1f} frames/s "
+          f"(target {args.cameras * args.fps:.1f})")
+    print(f"errors {sent - ok} ({(sent - ok) / max(sent, 1):.1%})  statuses {dict(stats.statuses)}")
+    if stats.degraded:
+        print(f"degraded {degraded} ({degraded / max(ok, 1):.1%} of 200s)  {dict(stats.degraded)}")
+    print(_latency_line("full", stats.latencies))
+    if stats.degraded_latencies:
+        print(_latency_line("degraded", stats.degraded_latencies))
+    if stats.stages:
+        print("\nserver stages (ms)     p50      p95      p99")
+        for stage, values in stats.stages.items():
+            print(f"  {stage:<16}{_pct(values, 50):>9.1f}{_pct(values, 95):>9.1f}{_pct(values, 99):>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--frames", help="Folder of JPEG frames to replay (default: synthetic)")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=float, default=5.0, help="Frames per second per camera")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout (s)")
+    parser.add_argument("--gallery", help="Optional gallery path passed to /api/recognize")
+    parser.add_argument("--record", action="store_true", help="Record one session per camera during the run")
+    args = parser.parse_args()
+
+    stats, elapsed = asyncio.run(run(args))
+    report(stats, elapsed, args)
+
+
+if __name__ == "__main__":
+    main()
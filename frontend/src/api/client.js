@@ -1,5 +1,23 @@
 const BASE_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
 
+/**
+ * Per-tab camera id, so each browser tab gets its own recording session and
+ * never receives another client's faces when the server sheds load.
+ * Kept in sessionStorage so it survives reloads of the same tab.
+ */
+const CAMERA_ID = (() => {
+    const key = "deepsecurity.camera";
+    let id = sessionStorage.getItem(key);
+    if (!id) {
+        // randomUUID is only available in secure contexts (https / localhost)
+        id = crypto.randomUUID?.() ?? `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+        sessionStorage.setItem(key, id);
+    }
+    return id;
+})();
+
+const cameraQuery = `camera=${encodeURIComponent(CAMERA_ID)}`;
+
 export const getRecordingFileUrl = (id, download = false) => {
     return `${BASE_URL}/api/history/recordings/${id}/file${download ? "?download=true" : ""}`;
 };
@@ -7,16 +25,22 @@ export const getRecordingFileUrl = (id, download = false) => {
 /**
  * Sends a video frame blob to the recognition endpoint.
  * @param {Blob} blob - JPEG image blob from canvas.toBlob()
- * @returns {Promise<{faces: Array}>}
+ * @returns {Promise<{faces: Array, degraded?: string, retry_after?: number}>}
  */
 export async function recognizeFrame(blob) {
     const form = new FormData();
     form.append("file", blob, "frame.jpg");
-    const res = await fetch(`${BASE_URL}/api/recognize`, {
+    const res = await fetch(`${BASE_URL}/api/recognize?${cameraQuery}`, {
         method: "POST",
         body: form,
     });
-    if (!res.ok) throw new Error(`recognize: ${res.status}`);
+    if (!res.ok) {
+        const err = new Error(`recognize: ${res.status}`);
+        // Overloaded server: wait as long as it asks before the next frame
+        const body = await res.json().catch(() => ({}));
+        err.retryAfter = body.retry_after;
+        throw err;
+    }
     return res.json();
 }
 
@@ -106,10 +130,10 @@ export async function browseFolder() {
 }
 
 /**
- * Commands the server to start recording the current stream.
+ * Commands the server to start recording this tab's stream.
  */
 export async function startRecording() {
-    const res = await fetch(`${BASE_URL}/api/recognize/start_recording`, {
+    const res = await fetch(`${BASE_URL}/api/recognize/start_recording?${cameraQuery}`, {
         method: "POST",
     });
     if (!res.ok) throw new Error(`startRecording: ${res.status}`);
@@ -120,7 +144,7 @@ export async function startRecording() {
  * Commands the server to stop recording and returns recording info.
  */
 export async function stopRecording() {
-    const res = await fetch(`${BASE_URL}/api/recognize/stop_recording`, {
+    const res = await fetch(`${BASE_URL}/api/recognize/stop_recording?${cameraQuery}`, {
         method: "POST",
     });
     if (!res.ok) throw new Error(`stopRecording: ${res.status}`);
@@ -132,7 +156,7 @@ export async function stopRecording() {
  * @returns {Promise<{is_recording: boolean}>}
  */
 export const getRecordingStatus = async () => {
-    const res = await fetch(`${BASE_URL}/api/recognize/status`);
+    const res = await fetch(`${BASE_URL}/api/recognize/status?${cameraQuery}`);
     if (!res.ok) throw new Error("Error fetching recording status");
     return await res.json();
 };
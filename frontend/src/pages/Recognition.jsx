@@ -4,6 +4,8 @@ import { recognizeFrame, startRecording, stopRecording, getRecordingStatus } fro
 const COLORS = {
     known: "#10b981",
     unknown: "#ef4444",
+    lowQuality: "#f59e0b",
+    degraded: "#94a3b8",
 };
 
 const LERP = 0.35;
@@ -136,9 +138,11 @@ export default function Recognition() {
                         setFps(fpsCounterRef.current.count);
                         fpsCounterRef.current = { count: 0, last: now };
                     }
+                    // Server is shedding load: back off as it suggests
+                    if (data.retry_after) await sleep(data.retry_after * 1000);
                 } catch (err) {
                     console.error("recognize error", err);
-                    await sleep(500);
+                    await sleep(err.retryAfter ? err.retryAfter * 1000 : 500);
                 }
             }
         }
@@ -215,8 +219,12 @@ export default function Recognition() {
             }
             const { x, y, w, h } = face.interp || face.box;
             const isKnown = face.name !== "Unknown";
-            const color = isKnown ? COLORS.known : COLORS.unknown;
-            const label = isKnown ? `${face.name}  ${Math.round(face.similarity * 100)}%` : "Desconocido";
+            const color = face.degraded ? COLORS.degraded : face.low_quality ? COLORS.lowQuality : isKnown ? COLORS.known : COLORS.unknown;
+            const label = face.degraded
+                ? "Sin verificar"
+                : face.low_quality
+                ? "Baja calidad"
+                : isKnown ? `${face.name}  ${Math.round(face.similarity * 100)}%` : "Desconocido";
 
             ctx.shadowColor = color;
             ctx.shadowBlur = 14;
@@ -373,9 +381,15 @@ export default function Recognition() {
                         <div key={i} className="card" style={{ padding: "14px 18px", display: "flex", alignItems: "center", gap: 12 }}>
                             <span className={`dot ${f.name !== "Unknown" ? "dot-green" : "dot-red"}`} />
                             <div>
-                                <div style={{ fontWeight: 600 }}>{f.name !== "Unknown" ? f.name : "Desconocido"}</div>
+                                <div style={{ fontWeight: 600 }}>
+                                    {f.degraded ? "Sin verificar" : f.low_quality ? "Baja calidad" : f.name !== "Unknown" ? f.name : "Desconocido"}
+                                </div>
                                 <div style={{ fontSize: "0.78rem", color: "var(--text-muted)" }}>
-                                    Similitud: {Math.round(f.similarity * 100)}%
+                                    {f.degraded
+                                        ? "Servidor saturado: solo detección"
+                                        : f.low_quality
+                                        ? `Omitido: ${f.quality.reasons.join(", ")}`
+                                        : `Similitud: ${Math.round(f.similarity * 100)}%`}
                                 </div>
                             </div>
                         </div>